@@ -1,7 +1,20 @@
+from typing import Optional
 from flask import Flask, request, jsonify, render_template
 from chatbot import Chatbot
+from chatbot.fetch_trace import tracing
+from chatbot.link_health import link_health
+from chatbot.prewarm import Prewarmer
+from chatbot.profiling import RequestProfiler
+from chatbot.query_log import AdaptivePrefetcher
+from chatbot.suggest import SuggestionIndex
+import gzip
+import hashlib
+import hmac
+import html
 import logging
+import os
 import traceback
+import zlib
 
 # Configure logging
 logging.basicConfig(
@@ -11,31 +24,112 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-chatbot = Chatbot()
+
+# Parse-pool workers are started with 'spawn', which re-imports this script as
+# __mp_main__ when it is run directly (python app.py). They only parse pages,
+# so they never build the chatbot or start its background threads.
+SERVING = __name__ != '__mp_main__'
+chatbot = Chatbot() if SERVING else None
+
+# Optionally warm every platform/task answer in the background at startup
+prewarmer = None
+if SERVING and os.environ.get('CHATBOT_PREWARM', '').lower() in ('1', 'true', 'yes'):
+    prewarmer = Prewarmer(chatbot.docs_extractor)
+    prewarmer.start()
+
+# Optionally keep the most-asked answers warm based on the rolling query log
+prefetcher = None
+if SERVING and os.environ.get('CHATBOT_ADAPTIVE_PREFETCH', '').lower() in ('1', 'true', 'yes'):
+    prefetcher = AdaptivePrefetcher(chatbot.docs_extractor, chatbot.query_log)
+    prefetcher.start()
+
+# Typeahead completions from platform/task phrases and parsed doc headings
+suggestions = SuggestionIndex(chatbot.suggestion_phrases) if SERVING else None
+SUGGEST_MAX_AGE = 60
+
+# On-demand CPU profiling of a sample of /ask requests
+profiler = RequestProfiler(
+    percent=float(os.environ.get('CHATBOT_PROFILE_PERCENT', 0)),
+    output_dir=os.environ.get('CHATBOT_PROFILE_DIR', os.path.join('cache', 'profiles'))
+)
+ADMIN_TOKEN = os.environ.get('CHATBOT_ADMIN_TOKEN')
+
+# HTTP caching and compression settings for /ask answers
+ANSWER_MAX_AGE = int(os.environ.get('CHATBOT_ANSWER_MAX_AGE', 300))
+COMPRESS_MIN_SIZE = 500
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript'}
 
 @app.route('/')
 def home():
     """Render the main chat interface"""
     return render_template('index.html')
 
-@app.route('/ask', methods=['POST'])
+@app.route('/ready')
+def ready():
+    """Readiness probe: 200 once the prewarm phase is done, 503 while warming"""
+    if prewarmer is None:
+        return jsonify({'ready': True, 'prewarm': 'disabled'})
+    status = prewarmer.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/ask', methods=['GET', 'POST'])
 def ask():
     """Handle chatbot questions and return answers"""
     try:
-        user_question = request.json.get('question')
+        # GET /ask?question=... lets browsers and proxies cache answers
+        payload = request.args if request.method == 'GET' else request.json
+        user_question = payload.get('question')
         if not user_question:
             return jsonify({'error': 'No question provided'}), 400
+        debug = str(payload.get('debug', '')).lower() in ('1', 'true', 'yes')
+        # Follow-up questions are resolved against the client's conversation session
+        session_id = request.headers.get('X-Session-Id') or payload.get('session_id')
+        if debug and not admin_authorized():
+            return jsonify({'error': 'Forbidden'}), 403
 
         logger.info(f"Received question: {user_question}")
         
-        # Get answer from chatbot
-        response = chatbot.get_answer(user_question)
+        if debug:
+            # Debug answers carry a per-URL fetch waterfall and are never cached
+            with tracing() as trace:
+                response = chatbot.get_answer(user_question, session_id)
+                formatted_answer = format_answer(response)
+            debug_response = jsonify({
+                'answer': formatted_answer,
+                'platform': response.get('platform') or response.get('platforms'),
+                'task': response.get('task'),
+                'error': response.get('error'),
+                'trace': trace.to_dict()
+            })
+            debug_response.headers['Cache-Control'] = 'no-store'
+            return debug_response
         
-        # Format the answer for display
-        formatted_answer = format_answer(response)
+        # A revalidation of a fully cached answer is settled before any retrieval or formatting
+        answer_tag = chatbot.answer_tag(user_question)
+        matched_tag = matching_etag(answer_tag) if answer_tag else None
+        if matched_tag:
+            # Still counts as asked, so the prefetcher sees the most revalidated answers
+            chatbot.touch_session(user_question, session_id)
+            return not_modified(matched_tag, private=bool(session_id))
+        
+        response = {}
+        profile = profiler.start()
+        try:
+            # Get answer from chatbot
+            response = chatbot.get_answer(user_question, session_id)
+            
+            # Format the answer for display
+            formatted_answer = format_answer(response)
+        finally:
+            profiler.finish(profile, response.get('platform'), response.get('task'))
         
         logger.info(f"Generated response for question: {user_question}")
-        return jsonify({'answer': formatted_answer})
+        # Answers that depend on session context must not be reused for other conversations
+        cacheable = 'error' not in response and not response.get('from_session')
+        return cacheable_answer(
+            formatted_answer, cacheable=cacheable,
+            etag=chatbot.answer_tag(user_question) if cacheable else None, private=bool(session_id)
+        )
 
     except Exception as e:
         logger.error(f"Error processing question: {str(e)}")
@@ -44,13 +138,140 @@ def ask():
             'error': 'An error occurred while processing your question'
         }), 500
 
+@app.route('/session/touch', methods=['POST'])
+def session_touch():
+    """Record a question the client answered from its own cache in the conversation session"""
+    payload = request.get_json(silent=True) or {}
+    question = payload.get('question')
+    if not question:
+        return jsonify({'error': 'No question provided'}), 400
+    chatbot.touch_session(question, request.headers.get('X-Session-Id') or payload.get('session_id'))
+    return '', 204
+
+@app.route('/suggest')
+def suggest():
+    """Return ranked question completions for the text typed so far"""
+    query = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', 8, type=int), 20))
+    response = jsonify({'query': query, 'suggestions': suggestions.complete(query, limit)})
+    response.headers['Cache-Control'] = f"public, max-age={SUGGEST_MAX_AGE}"
+    return response
+
+def admin_authorized() -> bool:
+    """Admin endpoints require the X-Admin-Token header and are disabled when CHATBOT_ADMIN_TOKEN is unset"""
+    if not ADMIN_TOKEN:
+        return False
+    return hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN)
+
+@app.route('/admin/profile', methods=['GET', 'POST'])
+def admin_profile():
+    """Inspect or reconfigure request profiling without restarting the service"""
+    if not admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    if request.method == 'POST':
+        settings = request.get_json(silent=True) or {}
+        if 'percent' in settings:
+            profiler.set_percent(settings['percent'])
+        if settings.get('reset'):
+            profiler.reset()
+
+    return jsonify({
+        **profiler.status(),
+        'hot_functions': profiler.hot_functions(
+            limit=request.args.get('limit', 25, type=int),
+            sort=request.args.get('sort', 'cumulative')
+        )
+    })
+
+@app.route('/admin/links', methods=['GET', 'POST'])
+def admin_links():
+    """Report configured documentation paths that are dead or redirect, optionally resetting what is known"""
+    if not admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    if request.method == 'POST':
+        settings = request.get_json(silent=True) or {}
+        if settings.get('reset'):
+            link_health.reset(redirects=bool(settings.get('redirects')))
+
+    return jsonify(chatbot.docs_extractor.link_report())
+
+def matching_etag(etag: str) -> Optional[str]:
+    """Return the variant of an ETag (plain or compressed) that If-None-Match holds, if any"""
+    for tag in (etag, f"{etag}-gzip", f"{etag}-deflate"):
+        if request.if_none_match.contains(tag):
+            return tag
+    return None
+
+def set_answer_cache_headers(response, cacheable: bool, private: bool):
+    """Answers to session-aware requests may only be cached by the client itself"""
+    if cacheable:
+        response.headers['Cache-Control'] = f"{'private' if private else 'public'}, max-age={ANSWER_MAX_AGE}"
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('X-Session-Id')
+
+def not_modified(etag: str, private: bool = False, cacheable: bool = True):
+    """Build a 304 for an answer the client already holds, echoing the ETag it matched"""
+    response = app.response_class(status=304)
+    response.set_etag(etag)
+    set_answer_cache_headers(response, cacheable, private)
+    return response
+
+def cacheable_answer(formatted_answer: str, cacheable: bool = True, etag: str = None, private: bool = False):
+    """Build the /ask response with a strong ETag, answering 304 when the client copy is current"""
+    # Fully cached answers are tagged by their docs' cache entries; others by their content
+    etag = etag or hashlib.sha256(formatted_answer.encode('utf-8')).hexdigest()[:32]
+
+    matched_tag = matching_etag(etag)
+    if matched_tag:
+        return not_modified(matched_tag, private, cacheable)
+
+    response = jsonify({'answer': formatted_answer})
+    response.set_etag(etag)
+    set_answer_cache_headers(response, cacheable, private)
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Compress sizeable text responses with gzip or deflate when the client accepts it"""
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    encoding = request.accept_encodings.best_match(['gzip', 'deflate'])
+    data = response.get_data()
+    if not encoding or len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    if encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=6))
+    else:
+        response.set_data(zlib.compress(data, 6))
+    response.headers['Content-Encoding'] = encoding
+
+    # A strong ETag identifies the exact bytes, so tag each encoding separately
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
 def format_answer(response: dict) -> str:
     """Format the chatbot response for display"""
     if not response:
         return "I'm sorry, I couldn't find an answer to your question. Please try rephrasing it."
 
-    # Start with the main answer content
-    formatted_answer = response.get('answer', '')
+    # Multi-platform questions are rendered as side-by-side sections
+    comparison = response.get('comparison')
+    if comparison:
+        return format_comparison(response)
+
+    # Start with the main answer content, highlighting the question's terms in each passage
+    passages = response.get('passages')
+    formatted_answer = format_passages(passages) if passages else response.get('answer', '')
 
     # Add source URL if available
     source_url = response.get('source_url')
@@ -77,5 +298,31 @@ def format_answer(response: dict) -> str:
 
     return formatted_answer
 
+def format_passages(passages: list) -> str:
+    """Render answer passages as a numbered list with their highlight spans marked"""
+    lines = ["Here's how you can do that:\n"]
+    for i, passage in enumerate(passages, 1):
+        text, parts, position = passage['content'], [], 0
+        for start, end in passage.get('highlights', []):
+            parts.append(html.escape(text[position:start]))
+            parts.append(f"<mark>{html.escape(text[start:end])}</mark>")
+            position = end
+        parts.append(html.escape(text[position:]))
+        lines.append(f"{i}. {''.join(parts)}")
+    return '\n'.join(lines) + '\n'
+
+def format_comparison(response: dict) -> str:
+    """Format a multi-platform comparison as side-by-side sections"""
+    sections = []
+    for section in response['comparison']:
+        sections.append(
+            "<div class='comparison-section'>"
+            f"<h4>{section.get('platform', '')}</h4>"
+            f"<div class='comparison-meta'>{section.get('status', 'ok')} &middot; {section.get('latency_ms', 0)} ms</div>"
+            f"{format_answer(section)}"
+            "</div>"
+        )
+    return f"{response.get('answer', '')}\n<div class='comparison'>{''.join(sections)}</div>"
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,90 @@
+"""
+Show that one degraded docs site cannot starve the other platforms.
+
+A fixed pool of ``--server-threads`` threads stands in for the web server's
+threads. Questions from the golden set arrive at ``--rate`` per second, in
+random order, and are answered against the recorded pages. One platform
+(``--degraded``, mParticle by default) is slow: each of its fetches hangs
+for ``--slow-ms`` and then fails, so its answers are never cached and every
+question about it goes back to the site. The run is repeated without
+bulkheads (unbounded queue, no deadline) and with the default per-platform
+bulkheads; the report shows p50/p95 latency, counted from arrival, and
+fallback answers (of which ``busy`` were turned away by a bulkhead) for the
+degraded and the healthy platforms.
+
+Usage:
+    python -m benchmarks.bench_bulkhead [--server-threads 8] [--requests 200] [--rate 50] [--slow-ms 1000]
+"""
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.bench_golden import QUESTIONS_PATH, RecordedPages, make_chatbot, percentile
+from chatbot.bulkhead import Bulkheads
+
+
+def serve(chatbot, cases: List[Dict], server_threads: int, rate: float) -> List[Dict]:
+    """Answer the cases as they arrive, returning each one's latency and outcome."""
+    def answer(case: Dict, arrived: float) -> Dict:
+        response = chatbot.get_answer(case['question'])
+        return {'platform': case['platform'], 'error': response.get('error'),
+                'ms': (time.perf_counter() - arrived) * 1000}
+
+    futures = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=server_threads) as server:
+        for index, case in enumerate(cases):
+            # Open loop: arrivals keep coming whether or not the server keeps up
+            time.sleep(max(0.0, start + index / rate - time.perf_counter()))
+            futures.append(server.submit(answer, case, time.perf_counter()))
+    return [future.result() for future in futures]
+
+
+def summarize(label: str, results: List[Dict]) -> str:
+    latencies = [result['ms'] for result in results]
+    fallbacks = sum(1 for result in results if result['error'])
+    busy = sum(1 for result in results if result['error'] == 'platform_busy')
+    return (f"  {label:9} {len(results):4d} asked  p50 {percentile(latencies, 0.5):8.1f} ms  "
+            f"p95 {percentile(latencies, 0.95):8.1f} ms  fallbacks {fallbacks} (busy {busy})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--server-threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--rate', type=float, default=50.0, help='arrivals per second')
+    parser.add_argument('--degraded', default='mparticle')
+    parser.add_argument('--slow-ms', type=float, default=1000.0, help='hang per degraded fetch')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='healthy fetch latency')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with open(QUESTIONS_PATH, encoding='utf-8') as f:
+        pool = [case for case in json.load(f)['cases'] if 'question' in case]
+    random.seed(args.seed)
+    cases = [random.choice(pool) for _ in range(args.requests)]
+
+    runs = [
+        ('no bulkheads', Bulkheads(max_concurrent=args.server_threads, max_queue=args.requests, timeout=None)),
+        ('bulkheads', Bulkheads())
+    ]
+    for label, bulkheads in runs:
+        chatbot = make_chatbot(RecordedPages(latency=args.latency_ms / 1000))
+        degraded = RecordedPages(latency=args.slow_ms / 1000)
+        degraded.index = {}  # every fetch hangs, then fails
+        degraded.install(chatbot.docs_extractor.extractors[args.degraded])
+        chatbot.docs_extractor.bulkheads = bulkheads
+
+        results = serve(chatbot, cases, args.server_threads, args.rate)
+        settings = bulkheads.settings
+        print(f"{label} (concurrency {settings['max_concurrent']}, queue {settings['max_queue']}, "
+              f"timeout {settings['timeout']})")
+        print(summarize(args.degraded, [r for r in results if r['platform'] == args.degraded]))
+        print(summarize('healthy', [r for r in results if r['platform'] != args.degraded]))
+
+
+if __name__ == '__main__':
+    main()
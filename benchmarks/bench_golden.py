@@ -0,0 +1,329 @@
+"""
+Golden-set retrieval quality and latency regression suite.
+
+Runs every case in ``benchmarks/golden/questions.json`` - one question per
+platform and task plus free-text searches - against recorded documentation
+pages in ``benchmarks/golden/pages/`` instead of the live sites. Task
+questions go through platform and task detection and ``get_relevant_docs``;
+search cases go through ``search_docs``. After an untimed warm-up pass, each
+case runs cold (page memo and answer caches bypassed) ``--runs`` times.
+
+A snippet is relevant when it comes from one of the case's expected URLs and
+contains one of its expected phrases. Reported metrics:
+
+- routing: share of task questions resolved to exactly the expected platform and task
+- recall@k: share of expected phrases found in relevant top-k snippets
+- MRR: mean reciprocal rank of the first relevant snippet
+- p95: 95th percentile latency of a cold retrieval
+
+The metrics are printed next to ``benchmarks/golden/baseline.json`` and the
+script exits with status 1 when any task question is misrouted, or when
+quality drops or latency grows past the thresholds. ``--record``
+re-downloads every configured documentation page into the fixtures;
+``--update-baseline`` accepts the current numbers unless a question is
+misrouted.
+
+Usage:
+    python -m benchmarks.bench_golden [--runs 5] [--update-baseline]
+    python -m benchmarks.bench_golden --record
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import requests
+
+from chatbot.chatbot import Chatbot
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+PAGES_DIR = os.path.join(GOLDEN_DIR, 'pages')
+QUESTIONS_PATH = os.path.join(GOLDEN_DIR, 'questions.json')
+BASELINE_PATH = os.path.join(GOLDEN_DIR, 'baseline.json')
+QUALITY_METRICS = ('routing', 'recall_at_k', 'mrr')
+
+
+class RecordedPages:
+    """
+    Serves recorded pages to extractors in place of network fetches.
+
+    `latency` seconds are slept per fetch to simulate the network, and every
+    fetch is counted per URL in `fetches`.
+    """
+
+    def __init__(self, directory: str = PAGES_DIR, latency: float = 0.0):
+        self.directory = directory
+        self.latency = latency
+        self.fetches: Counter = Counter()
+        self._lock = threading.Lock()
+        with open(os.path.join(directory, 'index.json'), encoding='utf-8') as f:
+            self.index: Dict[str, str] = json.load(f)
+
+    def body(self, url: str) -> Optional[bytes]:
+        with self._lock:
+            self.fetches[url] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        name = self.index.get(url)
+        if name is None:
+            return None
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            return f.read()
+
+    def fetch_text(self, url: str) -> Optional[str]:
+        body = self.body(url)
+        return None if body is None else body.decode('utf-8')
+
+    def open(self, url: str) -> Optional[requests.Response]:
+        body = self.body(url)
+        if body is None:
+            # Unrecorded pages behave like a 404
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response.raw = io.BytesIO(body)
+        return response
+
+    def adapter(self) -> 'RecordedAdapter':
+        return RecordedAdapter(self)
+
+    def install(self, extractor) -> None:
+        extractor._fetch_url = self.fetch_text
+        extractor._open_url = self.open
+
+
+class RecordedAdapter(requests.adapters.BaseAdapter):
+    """
+    requests transport that answers from recorded pages.
+
+    Mounted on a session, it lets a fetch run the whole polite fetch path
+    (link health, robots.txt, scheduler) with only the network replaced.
+    Unrecorded URLs, robots.txt included, answer 404.
+    """
+
+    def __init__(self, pages: RecordedPages):
+        super().__init__()
+        self.pages = pages
+
+    def send(self, request, **kwargs) -> requests.Response:
+        body = self.pages.body(request.url)
+        response = requests.Response()
+        response.status_code = 404 if body is None else 200
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        response.raw = io.BytesIO(body or b'')
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def record_pages(chatbot: Chatbot, directory: str = PAGES_DIR) -> None:
+    """Download every configured documentation page into the fixtures."""
+    docs = chatbot.docs_extractor
+    index = {}
+    for platform in docs.extractors:
+        extractor = docs.extractors[platform]
+        base_url = extractor.get_base_url().rstrip('/')
+        for paths in extractor.doc_sections.values():
+            for path in paths:
+                url = base_url + path
+                try:
+                    response = requests.get(url, headers=extractor.headers, timeout=30)
+                except requests.RequestException as e:
+                    print(f"skip {url}: {e}", file=sys.stderr)
+                    continue
+                if response.status_code != 200:
+                    print(f"skip {url}: HTTP {response.status_code}", file=sys.stderr)
+                    continue
+                name = f"{platform}_{path.strip('/').replace('/', '_') or 'index'}.html"
+                with open(os.path.join(directory, name), 'wb') as f:
+                    f.write(response.content)
+                index[url] = name
+                print(f"recorded {url} ({len(response.content)} bytes)")
+    with open(os.path.join(directory, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(index.items())), f, indent=2)
+        f.write('\n')
+
+
+def make_chatbot(pages: RecordedPages) -> Chatbot:
+    chatbot = Chatbot()
+    docs = chatbot.docs_extractor
+    # Measure extraction itself: no snapshot and no cross-process cache
+    docs.snapshot = None
+    docs.shared_cache = None
+    for platform in docs.extractors:
+        pages.install(docs.extractors[platform])
+    return chatbot
+
+
+def retrieve(chatbot: Chatbot, case: Dict) -> Dict:
+    """Run one case cold and return its ranked snippets and resolution."""
+    docs = chatbot.docs_extractor
+    for platform in docs.extractors.loaded():
+        docs.extractors[platform]._page_memo.clear()
+
+    if 'query' in case:
+        return {'routed': None, 'docs': docs.search_docs(case['query'], case['platform'], force_refresh=True)}
+
+    question = chatbot.question_handler.normalize_question(case['question'])
+    platforms = chatbot.identify_platforms(question)
+    task = chatbot.question_handler.extract_task(question)
+    results = []
+    if task:
+        for platform in platforms:
+            results.extend(docs.get_relevant_docs(platform, task, force_refresh=True))
+        results.sort(key=lambda doc: doc.relevance, reverse=True)
+    routed = platforms == [case['platform']] and task == case['task']
+    return {'routed': routed, 'docs': results}
+
+
+def score_case(case: Dict, docs: List, k: int) -> Dict:
+    """Reciprocal rank and recall@k of a case's ranked snippets."""
+    urls = set(case['expected_urls'])
+    phrases = [phrase.lower() for phrase in case['expected_phrases']]
+    reciprocal_rank = 0.0
+    found = set()
+    for rank, doc in enumerate(docs, start=1):
+        if doc.url not in urls:
+            continue
+        content = doc.content.lower()
+        matched = {phrase for phrase in phrases if phrase in content}
+        if matched and not reciprocal_rank:
+            reciprocal_rank = 1.0 / rank
+        if rank <= k:
+            found |= matched
+    return {'rr': reciprocal_rank, 'recall': len(found) / len(phrases) if phrases else 1.0}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def run_suite(chatbot: Chatbot, cases: List[Dict], k: int, runs: int) -> Dict:
+    # One untimed pass so imports and selector compilation are not counted
+    for case in cases:
+        retrieve(chatbot, case)
+    rows, latencies = [], []
+    # Like timeit, keep cyclic GC passes out of the timings: where they land
+    # shifts with every import and made one case's p95 jump between commits
+    gc.collect()
+    gc.disable()
+    try:
+        for case in cases:
+            case_latencies = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                result = retrieve(chatbot, case)
+                case_latencies.append((time.perf_counter() - start) * 1000)
+            latencies.extend(case_latencies)
+            scores = score_case(case, result['docs'], k)
+            rows.append({'id': case['id'], 'routed': result['routed'], 'snippets': len(result['docs']),
+                         'p95_ms': percentile(case_latencies, 0.95), **scores})
+    finally:
+        gc.enable()
+
+    routed = [row['routed'] for row in rows if row['routed'] is not None]
+    return {
+        'rows': rows,
+        'metrics': {
+            'routing': sum(routed) / len(routed) if routed else 1.0,
+            'recall_at_k': sum(row['recall'] for row in rows) / len(rows),
+            'mrr': sum(row['rr'] for row in rows) / len(rows),
+            'p95_ms': percentile(latencies, 0.95)
+        }
+    }
+
+
+def misrouted(rows: List[Dict]) -> List[str]:
+    return [f"{row['id']} was not routed to its expected platform and task"
+            for row in rows if row['routed'] is False]
+
+
+def regressions(metrics: Dict, baseline: Dict, max_quality_drop: float, max_latency_increase: float,
+                latency_slack_ms: float) -> List[str]:
+    failures = []
+    for name in QUALITY_METRICS:
+        if metrics[name] < baseline[name] - max_quality_drop:
+            failures.append(f"{name} dropped from {baseline[name]:.3f} to {metrics[name]:.3f}")
+    # Small absolute slack so millisecond-level noise on fast runs does not fail the suite
+    limit = max(baseline['p95_ms'] * (1 + max_latency_increase), baseline['p95_ms'] + latency_slack_ms)
+    if metrics['p95_ms'] > limit:
+        failures.append(f"p95 grew from {baseline['p95_ms']:.1f} ms to {metrics['p95_ms']:.1f} ms (limit {limit:.1f} ms)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--k', type=int, help='cutoff for recall@k (default: the baseline\'s, else 5)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-quality-drop', type=float, default=0.02,
+                        help='allowed absolute drop of routing, recall@k and MRR')
+    parser.add_argument('--max-latency-increase', type=float, default=0.5,
+                        help='allowed relative growth of p95 latency')
+    parser.add_argument('--latency-slack-ms', type=float, default=5.0,
+                        help='p95 growth in milliseconds that is always allowed')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--record', action='store_true', help='re-record the documentation pages')
+    args = parser.parse_args()
+
+    if args.record:
+        record_pages(Chatbot())
+        return
+
+    baseline = None
+    if os.path.exists(BASELINE_PATH) and not args.update_baseline:
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+    k = args.k or (baseline or {}).get('k', 5)
+    if baseline and baseline.get('k') != k:
+        print(f"Baseline was recorded with k={baseline.get('k')}; not comparing")
+        baseline = None
+
+    with open(QUESTIONS_PATH, encoding='utf-8') as f:
+        cases = json.load(f)['cases']
+    chatbot = make_chatbot(RecordedPages())
+    result = run_suite(chatbot, cases, k, args.runs)
+    metrics = result['metrics']
+
+    print(f"{'case':32} {'routed':>6} {'snips':>5} {'RR':>5} {'R@' + str(k):>5} {'p95 ms':>8}")
+    for row in result['rows']:
+        routed = '-' if row['routed'] is None else ('yes' if row['routed'] else 'NO')
+        print(f"{row['id']:32} {routed:>6} {row['snippets']:5d} {row['rr']:5.2f} {row['recall']:5.2f} {row['p95_ms']:8.1f}")
+
+    print()
+    print(f"{'metric':12} {'baseline':>9} {'current':>9}")
+    for name in QUALITY_METRICS + ('p95_ms',):
+        before = f"{baseline[name]:9.3f}" if baseline else f"{'-':>9}"
+        print(f"{name:12} {before} {metrics[name]:9.3f}")
+
+    # A misrouted question answers from the wrong docs, whatever the averages say
+    failures = misrouted(result['rows'])
+    if args.update_baseline and not failures:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'k': k, **{name: round(value, 4) for name, value in metrics.items()}}, f, indent=2)
+            f.write('\n')
+        print(f"\nWrote {BASELINE_PATH}")
+        return
+
+    if baseline:
+        failures += regressions(metrics, baseline, args.max_quality_drop, args.max_latency_increase,
+                                args.latency_slack_ms)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
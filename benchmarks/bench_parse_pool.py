@@ -0,0 +1,76 @@
+"""
+Measure page-parsing throughput in process vs. offloaded to the parse pool.
+
+Concurrent client threads repeatedly extract a synthetic mParticle page, as
+cold ``/ask`` requests do, first parsing in their own threads (GIL-bound),
+then through ``ParsePool`` with 1, 2, 4 and 8 worker processes. Reports
+pages/s and requests/s, where one cold request parses the three pages
+configured for a task.
+
+Usage:
+    python -m benchmarks.bench_parse_pool [--cores 1 2 4 8] [--clients 16] [--seconds 5] [--kb 200]
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_streaming import make_page
+from chatbot.parse_pool import parse_pool
+from chatbot.platform_extractors.mparticle_extractor import MParticleExtractor
+
+SECTIONS = ['audience', 'segments', 'targeting']
+PAGES_PER_REQUEST = 3
+
+
+def measure(extract, clients: int, seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    done = 0
+    lock = threading.Lock()
+
+    def client():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            extract()
+            with lock:
+                done += 1
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        for _ in range(clients):
+            executor.submit(client)
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cores', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--kb', type=int, default=200)
+    args = parser.parse_args()
+
+    extractor = MParticleExtractor()
+    html = make_page(args.kb * 1024).decode('utf-8')
+    url = 'bench'
+    print(f"page {len(html) / 1024:.0f} KiB, {args.clients} clients, {os.cpu_count()} CPUs")
+
+    runs = [('in-process', 0)] + [(f"pool x{cores}", cores) for cores in args.cores]
+    for label, cores in runs:
+        parse_pool.configure(cores)
+        if cores:
+            # Start every worker before timing
+            warm = ThreadPoolExecutor(max_workers=cores)
+            list(warm.map(lambda _: extractor._offloaded_page(html, url, 'extract_docs', SECTIONS), range(cores)))
+            warm.shutdown()
+            extract = lambda: extractor._offloaded_page(html, url, 'extract_docs', SECTIONS)
+        else:
+            extract = lambda: extractor._extract_page(html, url, SECTIONS)
+        pages = measure(extract, args.clients, args.seconds)
+        rate = pages / args.seconds
+        print(f"{label:12} {rate:8.1f} pages/s {rate / PAGES_PER_REQUEST:8.1f} requests/s")
+    parse_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Check that sampled request profiles cover the work done in pool threads.
+
+Answers every golden-set task question, plus a two-platform comparison
+for every task, cold against the recorded pages: once without profiling
+and once with every request sampled by ``RequestProfiler``, the way
+``/ask`` wraps ``get_answer``. Extraction runs in the bulkheads' threads
+and comparisons answer each platform in a thread of their own, so each
+sampled profile must still contain the ``_answer_for_platform`` and
+``extract_docs`` frames. Reports the profiling overhead and exits with
+status 1 for any sampled answer whose profile misses one of them.
+
+Usage:
+    python -m benchmarks.bench_profile [--latency-ms 5]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.bench_golden import QUESTIONS_PATH, RecordedPages, make_chatbot, percentile
+from chatbot.profiling import RequestProfiler
+from chatbot.suggest import TASK_PHRASES
+
+PROFILED_FRAMES = ('(_answer_for_platform)', '(extract_docs)')
+COMPARED_PLATFORMS = 'Lytics and mParticle'
+
+
+def questions() -> List[str]:
+    with open(QUESTIONS_PATH, encoding='utf-8') as f:
+        cases = [case['question'] for case in json.load(f)['cases'] if 'question' in case]
+    return cases + [phrases[0].format(platform=COMPARED_PLATFORMS) for phrases in TASK_PHRASES.values()]
+
+
+def answer_cold(chatbot, question: str) -> None:
+    docs = chatbot.docs_extractor
+    docs.refresh_cache()
+    for extractor in docs.extractors.loaded().values():
+        extractor._page_memo.clear()
+    chatbot.get_answer(question)
+
+
+def run(chatbot, cases: List[str], profiler: RequestProfiler = None) -> Dict:
+    latencies, missing = [], []
+    for question in cases:
+        if profiler is not None:
+            profiler.reset()
+        start = time.perf_counter()
+        sampled = profiler.start() if profiler is not None else None
+        try:
+            answer_cold(chatbot, question)
+        finally:
+            if profiler is not None:
+                profiler.finish(sampled)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if profiler is not None:
+            functions = [row['function'] for row in profiler.hot_functions(limit=100000)]
+            for frame in PROFILED_FRAMES:
+                if not any(function.endswith(frame) for function in functions):
+                    missing.append((question, frame))
+    return {'p50': percentile(latencies, 0.5), 'p95': percentile(latencies, 0.95), 'missing': missing}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='simulated fetch latency')
+    args = parser.parse_args()
+
+    chatbot = make_chatbot(RecordedPages(latency=args.latency_ms / 1000))
+    cases = questions()
+    # One untimed pass so imports and selector compilation are not counted
+    for question in cases:
+        answer_cold(chatbot, question)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        profiler = RequestProfiler(percent=100, output_dir=output_dir)
+        results = [('off', run(chatbot, cases)), ('sampled', run(chatbot, cases, profiler))]
+
+    for label, result in results:
+        print(f"{label:8} {len(cases):4d} answers  p50 {result['p50']:7.1f} ms  p95 {result['p95']:7.1f} ms")
+    missing = results[-1][1]['missing']
+    for question, frame in missing:
+        print(f"MISSING {frame} in the profile of: {question}")
+    if missing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark the batch relevance scorer against the per-snippet regex loop.
+
+Usage:
+    python -m benchmarks.bench_relevance [--snippets 10000]
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from chatbot.platform_extractors.relevance import RelevanceScorer
+
+VOCABULARY = [
+    'audiences', 'segments', 'targeting', 'sources', 'setup', 'configuration',
+    'profiles', 'identity', 'users', 'integrations', 'destinations', 'connections',
+    'data-sources', 'inputs', 'outputs', 'the', 'a', 'to', 'your', 'workspace',
+    'create', 'build', 'api', 'event', 'track', 'trait', 'attribute', 'sdk'
+]
+KEYWORDS = ['audiences', 'segments', 'targeting', 'data-sources', 'identity']
+
+
+def legacy_relevance(content: str, keywords: List[str]) -> float:
+    """The original per-keyword regex implementation, kept as the reference."""
+    if not keywords:
+        return 0.0
+    content = content.lower()
+    score = 0
+    for keyword in keywords:
+        count = len(re.findall(rf'\b{re.escape(keyword.lower())}\b', content))
+        score += 1 - (0.5 ** count)
+    return min(score / len(keywords), 1.0)
+
+
+def make_snippets(count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    snippets = []
+    for _ in range(count):
+        words = rng.choices(VOCABULARY, k=rng.randint(20, 120))
+        snippets.append(' '.join(word.capitalize() if rng.random() < 0.1 else word for word in words) + '.')
+    return snippets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--snippets', type=int, default=10000)
+    args = parser.parse_args()
+
+    snippets = make_snippets(args.snippets)
+
+    start = time.perf_counter()
+    expected = [legacy_relevance(snippet, KEYWORDS) for snippet in snippets]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = RelevanceScorer(KEYWORDS).score_batch(snippets)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    print(f"snippets:        {len(snippets)}")
+    print(f"legacy regex:    {legacy_seconds * 1000:.1f} ms")
+    print(f"batch scorer:    {batch_seconds * 1000:.1f} ms")
+    print(f"speedup:         {legacy_seconds / batch_seconds:.2f}x")
+    print(f"score mismatches: {mismatches}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare the memory footprint of dict snippets and slotted Snippet objects.
+
+Builds a synthetic corpus shaped like extractor output (a handful of pages,
+many snippets per page, some with code examples), where URLs arrive as
+distinct string objects the way they do after a JSON cache round trip.
+
+Usage:
+    python -m benchmarks.bench_snippet_memory [--snippets 50000]
+"""
+import argparse
+import json
+import random
+import tracemalloc
+from typing import Callable, Dict, List
+
+from chatbot.snippet import Snippet
+
+URLS = [f"https://docs.example.com/guides/platform-guide/page-{i}/" for i in range(40)]
+
+
+def make_raw_docs(count: int, seed: int = 3) -> List[Dict]:
+    rng = random.Random(seed)
+    docs = []
+    for i in range(count):
+        doc = {
+            'content': f"Snippet {i} " + 'lorem ipsum ' * rng.randint(5, 30),
+            'url': rng.choice(URLS),
+            'relevance': rng.random(),
+            'content_type': rng.choice(['tutorial', 'api', 'configuration', 'general'])
+        }
+        if rng.random() < 0.2:
+            doc['code_examples'] = [f"analytics.track('event_{i}')"]
+        docs.append(doc)
+    # A JSON round trip gives every snippet its own copy of the repeated strings
+    return json.loads(json.dumps(docs))
+
+
+def measure(build: Callable[[], list]) -> int:
+    tracemalloc.start()
+    corpus = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del corpus
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--snippets', type=int, default=50000)
+    args = parser.parse_args()
+
+    raw_json = json.dumps(make_raw_docs(args.snippets))
+
+    dict_bytes = measure(lambda: json.loads(raw_json))
+    snippet_bytes = measure(lambda: [Snippet.from_dict(doc) for doc in json.loads(raw_json)])
+
+    print(f"snippets:         {args.snippets}")
+    print(f"dict snippets:    {dict_bytes / 1024 / 1024:8.2f} MiB")
+    print(f"Snippet objects:  {snippet_bytes / 1024 / 1024:8.2f} MiB")
+    print(f"saving:           {1 - snippet_bytes / dict_bytes:8.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure cold-start import cost of the web app and the chatbot package.
+
+Runs a fresh interpreter with ``-X importtime`` for each target and reports
+wall-clock time plus the heaviest cumulative imports, so regressions in
+worker startup show up next to the other benchmarks.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'chatbot': 'import chatbot; chatbot.Chatbot()',
+    'app': 'import app',
+}
+
+
+def run_importtime(statement: str) -> Tuple[float, List[Tuple[int, str]]]:
+    """
+    Run a statement in a fresh interpreter with -X importtime.
+    
+    Returns:
+        Tuple[float, List[Tuple[int, str]]]: Wall-clock seconds and
+        (cumulative microseconds, module) for every imported module.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nesting depth is encoded as two extra spaces per level after the first
+        modules.append((int(cumulative_us), name[1:].rstrip()))
+    return elapsed, modules
+
+
+def summarize(target: str, runs: int, top: int) -> Dict:
+    timings = []
+    modules: List[Tuple[int, str]] = []
+    for _ in range(runs):
+        elapsed, modules = run_importtime(TARGETS[target])
+        timings.append(elapsed)
+    top_level = [entry for entry in modules if not entry[1].startswith(' ')]
+    return {
+        'target': target,
+        'median_ms': statistics.median(timings) * 1000,
+        'min_ms': min(timings) * 1000,
+        'import_ms': sum(us for us, _ in top_level) / 1000,
+        'heaviest': sorted(modules, reverse=True)[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('targets', nargs='*', default=list(TARGETS))
+    args = parser.parse_args()
+
+    for target in args.targets:
+        result = summarize(target, args.runs, args.top)
+        print(f"== {target}: median {result['median_ms']:.1f} ms, min {result['min_ms']:.1f} ms, "
+              f"imports {result['import_ms']:.1f} ms")
+        for cumulative_us, name in result['heaviest']:
+            print(f"  {cumulative_us / 1000:8.2f} ms  {name.strip()}")
+
+
+if __name__ == '__main__':
+    main()
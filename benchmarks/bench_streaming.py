@@ -0,0 +1,81 @@
+"""
+Compare whole-page parsing with streaming section-by-section extraction.
+
+Builds a synthetic API-reference page of the requested size and extracts it
+with the mParticle rules twice: once parsed as a whole, and once streamed in
+chunks through ``_stream_page``. Reports time, peak memory and bytes read.
+
+Usage:
+    python -m benchmarks.bench_streaming [--mb 20] [--sections audience]
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from chatbot.platform_extractors.mparticle_extractor import MParticleExtractor
+
+SECTION = """<h2>Method {i}</h2><p>Call method {i} to configure the SDK for your app.</p>
+<pre class="highlight">mParticle.logEvent('event_{i}', mParticle.EventType.Navigation);</pre>
+<h3>Audience membership {i}</h3><p>Method {i} updates audience membership for the current user.</p>
+<ul><li>Parameter {i}: the audience id</li></ul>
+"""
+
+
+def make_page(size: int) -> bytes:
+    parts, total, i = ['<html><body><main><h1>SDK reference</h1>'], 0, 0
+    while total < size:
+        section = SECTION.format(i=i)
+        parts.append(section)
+        total += len(section)
+        i += 1
+    parts.append('</main></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def measure(run: Callable[[], list]) -> Tuple[int, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(results), elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mb', type=float, default=20)
+    parser.add_argument('--sections', nargs='+', default=['audience'])
+    args = parser.parse_args()
+
+    extractor = MParticleExtractor()
+    page = make_page(int(args.mb * 1024 * 1024))
+    chunk = extractor.STREAM_CHUNK_SIZE
+
+    def whole():
+        return extractor._extract_page(page.decode('utf-8'), 'bench', args.sections)
+
+    read = 0
+
+    def chunks():
+        nonlocal read
+        for start in range(0, len(page), chunk):
+            read += chunk
+            yield page[start:start + chunk]
+
+    def streamed():
+        return extractor._stream_page('bench', chunks(), extractor._decoder('utf-8'),
+                                      'extract_docs', args.sections)
+
+    whole_count, whole_time, whole_peak = measure(whole)
+    stream_count, stream_time, stream_peak = measure(streamed)
+
+    print(f"page:      {len(page) / 1024 / 1024:8.1f} MiB")
+    print(f"whole:     {whole_count:6d} snippets {whole_time * 1000:9.1f} ms  peak {whole_peak / 1024 / 1024:8.1f} MiB")
+    print(f"streamed:  {stream_count:6d} snippets {stream_time * 1000:9.1f} ms  peak {stream_peak / 1024 / 1024:8.1f} MiB"
+          f"  ({min(read, len(page)) / 1024 / 1024:.2f} MiB read)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Stress test the answer stack under concurrent ``get_answer`` calls.
+
+Serves the golden-set recorded pages with simulated network latency, and
+first answers a set of conversations (golden questions, some with a
+follow-up in the same session) on a single thread to get the expected
+answers. Each round then drops the answer caches and page memos and replays
+the conversations from ``--threads`` threads at once, about ``--calls``
+questions in total, each conversation in its own session. A final round
+does the same while another thread keeps refreshing the caches.
+
+Every answer must match its single-threaded answer, and in the cold rounds
+no page of a cached answer may be fetched more than once (concurrent misses
+for the same platform and task must share one extraction; empty answers are
+not cached, so they are extracted again by design). Exits with status 1 on any
+mismatch, error or duplicate fetch.
+
+Segment pages are not stubbed at the extractor: its per-thread sessions get
+a transport that serves the recorded pages, so those fetches go through
+link health, robots.txt and the shared scheduler like real ones.
+
+Usage:
+    python -m benchmarks.bench_threads [--threads 64] [--calls 400] [--rounds 3]
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from benchmarks.bench_golden import QUESTIONS_PATH, RecordedPages, make_chatbot
+from chatbot.bulkhead import Bulkheads
+from chatbot.fetch_scheduler import scheduler
+from chatbot.link_health import link_health
+
+FOLLOW_UPS = ['How do I integrate data?', 'How do I create a profile?']
+
+
+def answer_key(response: Dict) -> str:
+    """The parts of a response that must not depend on concurrency."""
+    return json.dumps({
+        'answer': response.get('answer'),
+        'error': response.get('error'),
+        'platform': response.get('platform') or response.get('platforms'),
+        'task': response.get('task'),
+        'comparison': [section.get('answer') for section in response.get('comparison', [])]
+    }, sort_keys=True)
+
+
+def conversations() -> List[List[str]]:
+    with open(QUESTIONS_PATH, encoding='utf-8') as f:
+        questions = [case['question'] for case in json.load(f)['cases'] if 'question' in case]
+    scripts = [[question] for question in questions]
+    scripts += [[question, FOLLOW_UPS[i % len(FOLLOW_UPS)]] for i, question in enumerate(questions)]
+    return scripts
+
+
+def converse(chatbot, script: List[str]) -> List[str]:
+    session_id = uuid.uuid4().hex
+    return [answer_key(chatbot.get_answer(question, session_id)) for question in script]
+
+
+def reset(chatbot, pages: RecordedPages) -> None:
+    docs = chatbot.docs_extractor
+    docs.refresh_cache()
+    for extractor in docs.extractors.loaded().values():
+        extractor._page_memo.clear()
+    pages.fetches.clear()
+
+
+def duplicate_fetches(chatbot, pages: RecordedPages) -> Dict[str, int]:
+    """Pages fetched more than once for a platform/task whose answer was cached."""
+    docs = chatbot.docs_extractor
+    duplicates = {}
+    for platform, task in list(docs.docs_cache):
+        extractor = docs.extractors[platform]
+        for path in extractor._doc_paths(task):
+            url = extractor.get_base_url().rstrip('/') + path
+            if pages.fetches[url] > 1:
+                duplicates[url] = pages.fetches[url]
+    return duplicates
+
+
+def run_round(chatbot, scripts: List[List[str]], expected: List[List[str]], threads: int,
+              calls: int) -> Dict:
+    per_pass = sum(len(script) for script in scripts)
+    indices = [index for _ in range(max(1, calls // per_pass)) for index in range(len(scripts))]
+    random.shuffle(indices)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda index: (index, converse(chatbot, scripts[index])), indices))
+    elapsed = time.perf_counter() - start
+
+    mismatches = [(scripts[index], answers) for index, answers in results if answers != expected[index]]
+    answered = sum(len(answers) for _, answers in results)
+    return {'calls': answered, 'seconds': elapsed, 'mismatches': mismatches}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--calls', type=int, default=400)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='simulated fetch latency')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    pages = RecordedPages(latency=args.latency_ms / 1000)
+    chatbot = make_chatbot(pages)
+    # Every thread must be answered here: no load shedding
+    chatbot.docs_extractor.bulkheads = Bulkheads(max_queue=args.threads, timeout=None)
+    # Segment fetches run the real fetch path over recorded pages, unpaced,
+    # and keep their link health in memory rather than in the cache directory
+    segment = chatbot.docs_extractor.extractors['segment']
+    del segment._fetch_url
+    segment._new_adapter = pages.adapter
+    scheduler.host_rates[urlsplit(segment.get_base_url()).netloc] = 1e9
+    link_health.path = None
+    scripts = conversations()
+    expected = [converse(chatbot, script) for script in scripts]
+
+    failed = False
+    for round_number in range(1, args.rounds + 2):
+        churn = round_number > args.rounds
+        reset(chatbot, pages)
+        stop = threading.Event()
+        refresher = None
+        if churn:
+            def refresh_loop():
+                while not stop.wait(0.005):
+                    chatbot.docs_extractor.refresh_cache()
+            refresher = threading.Thread(target=refresh_loop, daemon=True)
+            refresher.start()
+        try:
+            result = run_round(chatbot, scripts, expected, args.threads, args.calls)
+        finally:
+            stop.set()
+            if refresher is not None:
+                refresher.join()
+
+        duplicates = {} if churn else duplicate_fetches(chatbot, pages)
+        label = 'churn' if churn else f"round {round_number}"
+        print(f"{label:8} {result['calls']:5d} calls in {result['seconds']:6.2f}s "
+              f"({result['calls'] / result['seconds']:7.1f}/s)  mismatches {len(result['mismatches'])}  "
+              f"duplicate fetches {len(duplicates)}")
+        for script, answers in result['mismatches'][:5]:
+            print(f"  MISMATCH {script}: {answers}")
+        for url, count in list(duplicates.items())[:5]:
+            print(f"  DUPLICATE {url} fetched {count} times")
+        failed = failed or bool(result['mismatches'] or duplicates)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
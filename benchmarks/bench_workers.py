@@ -0,0 +1,109 @@
+"""
+Measure /ask throughput of the pre-fork server as the worker count grows.
+
+Starts ``gunicorn -c gunicorn.conf.py app:app`` once per worker count, all
+pointing at the same shared cache directory, and drives it with concurrent
+clients. The first run warms the shared cache; later runs should scale
+close to linearly because no worker repeats a crawl.
+
+Usage:
+    python -m benchmarks.bench_workers [--workers 1 2 4 8] [--seconds 10]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = [
+    "How do I set up a new source in Segment?",
+    "How can I create a user profile in mParticle?",
+    "How do I build an audience segment in Lytics?",
+    "How can I integrate my data with Zeotap?",
+]
+
+
+def ask(base_url: str, question: str) -> int:
+    request = urllib.request.Request(
+        f"{base_url}/ask",
+        data=json.dumps({'question': question}).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request, timeout=120) as response:
+        response.read()
+        return response.status
+
+
+def wait_until_up(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/ready", timeout=2):
+                return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not come up")
+
+
+def run_load(base_url: str, clients: int, seconds: float) -> float:
+    """Return requests/sec sustained by `clients` concurrent loops."""
+    stop_at = time.time() + seconds
+    count = 0
+    lock = threading.Lock()
+
+    def loop(offset: int):
+        nonlocal count
+        i = offset
+        while time.time() < stop_at:
+            ask(base_url, QUESTIONS[i % len(QUESTIONS)])
+            i += 1
+            with lock:
+                count += 1
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(loop, range(clients)))
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--clients-per-worker', type=int, default=4)
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    shared_dir = tempfile.mkdtemp(prefix='chatbot-shared-')
+    env = dict(os.environ, CHATBOT_SHARED_CACHE_DIR=shared_dir, CHATBOT_BIND=f"127.0.0.1:{args.port}")
+
+    baseline = None
+    for workers in args.workers:
+        env['CHATBOT_WORKERS'] = str(workers)
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+            cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_up(base_url)
+            # Warm: every question is answered once so the shared cache is populated
+            for question in QUESTIONS:
+                ask(base_url, question)
+            rps = run_load(base_url, workers * args.clients_per_worker, args.seconds)
+        finally:
+            server.terminate()
+            server.wait()
+        baseline = baseline or rps
+        print(f"workers={workers:<3} {rps:9.1f} req/s  scaling {rps / baseline:5.2f}x "
+              f"(efficiency {rps / baseline / workers:5.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Answer a JSONL file of questions offline.
+
+Each input line is a JSON object. The question is read from ``--field`` or,
+by default, from the first non-empty one of ``question``, ``query``,
+``title`` and ``body`` (so backlog files with ``request_id``/``title``/
+``body`` work as-is). The record ID comes from ``id`` or ``request_id``,
+falling back to the line number.
+
+Questions are streamed through a thread or process pool with at most
+``--window`` in flight, and answers are written in input order as they
+complete, so memory stays bounded however long the file is. Threads share
+one ``Chatbot`` and its in-memory caches; every worker process builds its
+own ``Chatbot`` and they share fetched pages through the on-disk cache in
+``--shared-cache``.
+
+Usage:
+    python -m chatbot.batch questions.jsonl -o answers.jsonl [--workers 8] [--mode process]
+"""
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from .fetch_scheduler import PRIORITY_BACKGROUND, fetch_priority
+
+logger = logging.getLogger(__name__)
+
+QUESTION_FIELDS = ('question', 'query', 'title', 'body')
+ID_FIELDS = ('id', 'request_id')
+
+# The Chatbot used by answer_one: shared by all threads, or one per worker process
+_chatbot = None
+
+
+def read_questions(stream: TextIO, field: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Lazily read question records from a JSONL stream.
+
+    Args:
+        stream (TextIO): Open JSONL input
+        field (Optional[str]): Field holding the question; auto-detected if None
+
+    Returns:
+        Iterator[Dict]: Records with 'line', 'id' and 'question' ('error' is
+        set instead of 'question' for lines that cannot be used)
+    """
+    fields = (field,) if field else QUESTION_FIELDS
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield {'line': line_number, 'id': line_number, 'error': 'invalid_json'}
+            continue
+        if not isinstance(data, dict):
+            yield {'line': line_number, 'id': line_number, 'error': 'invalid_record'}
+            continue
+        record_id = next((data[key] for key in ID_FIELDS if data.get(key) is not None), line_number)
+        question = next((data[key] for key in fields if isinstance(data.get(key), str) and data[key].strip()), None)
+        if question is None:
+            yield {'line': line_number, 'id': record_id, 'error': 'question_not_found'}
+        else:
+            yield {'line': line_number, 'id': record_id, 'question': question}
+
+
+def _init_worker() -> None:
+    global _chatbot
+    from .chatbot import Chatbot
+
+    _chatbot = Chatbot()
+
+
+def answer_one(record: Dict) -> Dict:
+    """
+    Answer one question record with the worker's Chatbot.
+
+    Args:
+        record (Dict): Record from ``read_questions``
+
+    Returns:
+        Dict: Output row with the answer, platform, task, error and latency
+    """
+    start = time.perf_counter()
+    try:
+        # Offline answers wait for slow platforms instead of falling back
+        with fetch_priority(PRIORITY_BACKGROUND):
+            response = _chatbot.get_answer(record['question'])
+    except Exception as e:
+        logger.error(f"Error answering line {record['line']}: {e}")
+        response = {'answer': None, 'error': 'batch_error'}
+    row = {
+        'id': record['id'],
+        'line': record['line'],
+        'question': record['question'],
+        'platform': response.get('platform'),
+        'task': response.get('task'),
+        'answer': response.get('answer'),
+        'error': response.get('error'),
+        'latency_ms': round((time.perf_counter() - start) * 1000, 1)
+    }
+    if 'platforms' in response:
+        row['platforms'] = response['platforms']
+        row['comparison'] = response['comparison']
+    if 'source_url' in response:
+        row['source_url'] = response['source_url']
+    return row
+
+
+def _skipped_row(record: Dict) -> Dict:
+    return {
+        'id': record['id'],
+        'line': record['line'],
+        'question': record.get('question'),
+        'platform': None,
+        'task': None,
+        'answer': None,
+        'error': record['error'],
+        'latency_ms': 0.0
+    }
+
+
+def run_batch(records: Iterator[Dict], output: TextIO, executor: Executor, window: int) -> Tuple[int, int]:
+    """
+    Answer records on an executor and write output rows in input order.
+
+    At most `window` questions are submitted but not yet written, so only
+    that many records and answers are held in memory at once.
+
+    Args:
+        records (Iterator[Dict]): Records from ``read_questions``
+        output (TextIO): Stream the JSONL answers are written to
+        executor (Executor): Pool running ``answer_one``
+        window (int): Maximum number of questions in flight
+
+    Returns:
+        Tuple[int, int]: Number of rows written and number of rows with an error
+    """
+    pending: "deque[Future]" = deque()
+    written = errors = 0
+
+    def write_oldest() -> None:
+        nonlocal written, errors
+        row = pending.popleft().result()
+        output.write(json.dumps(row) + '\n')
+        written += 1
+        errors += row['error'] is not None
+
+    for record in records:
+        if 'error' in record:
+            done: Future = Future()
+            done.set_result(_skipped_row(record))
+            pending.append(done)
+        else:
+            pending.append(executor.submit(answer_one, record))
+        while len(pending) >= window:
+            write_oldest()
+    while pending:
+        write_oldest()
+    return written, errors
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Answer a JSONL file of questions offline')
+    parser.add_argument('input', help="JSONL questions ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL answers ('-' for stdout)")
+    parser.add_argument('--field', help='field holding the question (default: auto-detect)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--mode', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--window', type=int, help='maximum questions in flight (default: 4 per worker)')
+    parser.add_argument('--shared-cache', default=os.path.join('cache', 'shared'),
+                        help='on-disk page cache shared by every worker')
+    args = parser.parse_args(argv)
+
+    workers = max(1, args.workers)
+    window = max(1, args.window or workers * 4)
+    # Set before any Chatbot exists so worker processes inherit it
+    os.environ.setdefault('CHATBOT_SHARED_CACHE_DIR', args.shared_cache)
+
+    if args.mode == 'process':
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    else:
+        _init_worker()
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        with executor:
+            written, errors = run_batch(read_questions(source, args.field), output, executor, window)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Answered {written} questions ({errors} with errors) in {elapsed:.1f}s "
+          f"({written / elapsed if elapsed else 0:.1f}/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
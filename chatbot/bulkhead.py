@@ -0,0 +1,177 @@
+from typing import Any, Callable, Dict, Iterator, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from contextlib import contextmanager
+import contextvars
+import logging
+import os
+import threading
+from .fetch_scheduler import PRIORITY_BACKGROUND, current_priority
+from .profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = int(os.environ.get('CHATBOT_BULKHEAD_CONCURRENCY', 2))
+DEFAULT_QUEUE = int(os.environ.get('CHATBOT_BULKHEAD_QUEUE', 4))
+DEFAULT_TIMEOUT = float(os.environ.get('CHATBOT_BULKHEAD_TIMEOUT', 10))
+
+
+class BulkheadFull(Exception):
+    """Raised when a platform's bulkhead turns a call away or it waited too long."""
+
+
+class Bulkhead:
+    """
+    Bounded worker pool and waiting room for one platform's extractions.
+
+    At most `max_concurrent` extractions run at once, in the bulkhead's own
+    threads, and at most `max_concurrent + max_queue` calls may be queued, and
+    as many callers waiting, at any time; further calls are rejected
+    immediately. Callers wait at most `timeout` seconds for a result. A call
+    that times out keeps running in the pool, so its result still lands in
+    the caches. Background callers (see ``fetch_priority``) run in a
+    separate lane of `max_concurrent` threads: they never take a place in
+    the user-facing queue, are never rejected, and wait without a deadline.
+    Their own pools (prewarming, batch answers) bound how many there are.
+    """
+
+    def __init__(self, name: str, max_concurrent: int = DEFAULT_CONCURRENCY,
+                 max_queue: int = DEFAULT_QUEUE, timeout: Optional[float] = DEFAULT_TIMEOUT):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                            thread_name_prefix=f"bulkhead-{name}")
+        self._background = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                              thread_name_prefix=f"bulkhead-{name}-background")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._background_pending = 0
+        self._waiting = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrent + self.max_queue
+
+    def _reject(self, reason: str) -> BulkheadFull:
+        self.rejected += 1
+        logger.warning(f"Bulkhead {self.name} rejected a call: {reason}")
+        return BulkheadFull(f"{self.name} is busy ({reason})")
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Count the enclosed caller as waiting on this platform.
+
+        Raises:
+            BulkheadFull: If the waiting room is full.
+        """
+        if current_priority() >= PRIORITY_BACKGROUND:
+            yield
+            return
+        with self._lock:
+            if self._waiting >= self.capacity:
+                raise self._reject(f"{self._waiting} callers waiting")
+            self._waiting += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """
+        Queue a call on the bulkhead's workers, in a copy of the caller's context,
+        profiled with the caller's request when it is sampled.
+
+        Background callers are queued in the background lane instead.
+
+        Args:
+            fn (Callable): Function to run.
+            *args: Its arguments.
+
+        Returns:
+            Future: The call's future.
+
+        Raises:
+            BulkheadFull: If the pool's queue is full.
+        """
+        if current_priority() >= PRIORITY_BACKGROUND:
+            with self._lock:
+                self._background_pending += 1
+            future = self._background.submit(contextvars.copy_context().run, profiled, fn, *args)
+            future.add_done_callback(self._background_finished)
+            return future
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise self._reject(f"{self._pending} calls queued")
+            self._pending += 1
+        future = self._executor.submit(contextvars.copy_context().run, profiled, fn, *args)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _background_finished(self, future: Future) -> None:
+        with self._lock:
+            self._background_pending -= 1
+
+    def wait(self, future: Future) -> Any:
+        """
+        Wait for a submitted call, up to the timeout for user-facing callers.
+
+        Raises:
+            BulkheadFull: If the result did not arrive in time.
+        """
+        timeout = None if current_priority() >= PRIORITY_BACKGROUND else self.timeout
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            logger.warning(f"Bulkhead {self.name} call exceeded {timeout}s")
+            raise BulkheadFull(f"{self.name} did not answer within {timeout}s")
+
+    def run(self, fn: Callable, *args) -> Any:
+        """Admit the caller, run `fn` on the bulkhead and wait for its result."""
+        with self.admit():
+            return self.wait(self.submit(fn, *args))
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'timeout': self.timeout,
+                'pending': self._pending,
+                'background_pending': self._background_pending,
+                'waiting': self._waiting,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out
+            }
+
+
+class Bulkheads:
+    """One ``Bulkhead`` per platform, created on first use with shared settings."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_CONCURRENCY, max_queue: int = DEFAULT_QUEUE,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT):
+        self.settings = {'max_concurrent': max_concurrent, 'max_queue': max_queue, 'timeout': timeout}
+        self._bulkheads: Dict[str, Bulkhead] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, platform: str) -> Bulkhead:
+        with self._lock:
+            bulkhead = self._bulkheads.get(platform)
+            if bulkhead is None:
+                bulkhead = self._bulkheads[platform] = Bulkhead(platform, **self.settings)
+            return bulkhead
+
+    def status(self) -> Dict[str, Dict]:
+        with self._lock:
+            bulkheads = dict(self._bulkheads)
+        return {platform: bulkhead.status() for platform, bulkhead in bulkheads.items()}
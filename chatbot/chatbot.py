@@ -1,12 +1,31 @@
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import hashlib
+import json
 import re
+import time
+from .bulkhead import BulkheadFull
 from .docs_extractor import DocsExtractor
+from .passages import passage_for, term_keys
+from .profiling import profiled
 from .question_handler import QuestionHandler
+from .query_log import QueryLog
+from .sessions import SessionStore
+from .suggest import PLATFORM_NAMES, TASK_PHRASES, Suggestion
+
+# Words before "segment" that make it the audience-segment noun, not the platform
+SEGMENT_NOUN_CONTEXT = re.compile(
+    r'\b(?:a|an|the|audience|new|my|our|this|that|each|every|user|customer|'
+    r'build|create|define|make|set\s*up)\s+$'
+)
 
 class Chatbot:
     def __init__(self):
         self.docs_extractor = DocsExtractor()
         self.question_handler = QuestionHandler()
+        self.query_log = QueryLog()
+        self.sessions = SessionStore()
         self.cdp_platforms = {
             'segment': 'https://segment.com/docs/?ref=nav',
             'mparticle': 'https://docs.mparticle.com/',
@@ -14,74 +33,286 @@ class Chatbot:
             'zeotap': 'https://docs.zeotap.com/home/en-us/'
         }
 
-    def get_answer(self, question: str) -> Dict:
+    def get_answer(self, question: str, session_id: Optional[str] = None) -> Dict:
         """
         Process the user's question and return an appropriate answer
         
+        With a session ID, a follow-up question that names no platform or no
+        task takes it from the session's previous question, and reuses the
+        snippets already retrieved when it resolves to the same platform and
+        task. Such answers are marked 'from_session' and are not shareable.
+        
         Args:
             question (str): The user's question
+            session_id (Optional[str]): Client conversation session ID
             
         Returns:
-            Dict: Contains the answer and any relevant metadata
+            Dict: Contains the answer and any relevant metadata; 'from_session'
+            is set when the session filled in the platform or task
         """
         try:
             # Normalize the question
             processed_question = self.question_handler.normalize_question(question)
+            session = self.sessions.get(session_id)
+            from_session = False
             
-            # Identify the CDP platform being asked about
-            platform = self.identify_platform(processed_question)
+            # Identify every CDP platform being asked about
+            platforms = self.identify_platforms(processed_question)
+            if not platforms and session and session.platform:
+                platforms = [session.platform]
+                from_session = True
             
-            if not platform:
+            if not platforms:
                 return {
                     'answer': "I couldn't identify which CDP platform you're asking about. Please specify if your question is about Segment, mParticle, Lytics, or Zeotap.",
                     'error': 'platform_not_found'
                 }
+            platform = platforms[0]
             
             # Extract the specific task or action being asked about
             task = self.question_handler.extract_task(processed_question)
+            if not task and session and session.task:
+                task = session.task
+                from_session = True
+            
+            # Record what the question resolved to so hot answers can be kept warm
+            keywords = self.question_handler.extract_keywords(processed_question)
+            for p in platforms:
+                self.query_log.record(p, task, keywords)
             
             if not task:
+                self.sessions.update(session_id, platform, None)
                 return {
                     'platform': platform,
                     'answer': f"I understand you're asking about {platform}, but could you please be more specific about what you'd like to do? For example, you can ask about setting up sources, creating profiles, building segments, or integrating data.",
                     'error': 'task_not_found'
                 }
             
-            # Get relevant documentation
+            if len(platforms) > 1:
+                response = self.get_comparison(platforms, task, keywords)
+                self.sessions.update(session_id, platform, task)
+            else:
+                # A follow-up that resolved through the session reuses its snippets; a question
+                # that names its platform and task is answered fresh, so it can be shared
+                reuse = (from_session and session and (session.platform, session.task) == (platform, task)
+                         and session.snippets)
+                response = self._answer_for_platform(
+                    platform, task, docs=session.snippets if reuse else None, session_id=session_id,
+                    keywords=keywords
+                )
+            
+            if from_session:
+                response['from_session'] = True
+            return response
+            
+        except Exception as e:
+            return {
+                'answer': "I apologize, but I encountered an error while processing your question. Please try rephrasing it or ask something else.",
+                'error': 'general_error'
+            }
+
+    def answer_tag(self, question: str) -> Optional[str]:
+        """
+        Version tag of the answer to a question, computed without retrieving anything
+        
+        Only questions that name their platforms and task are tagged: their
+        answer depends on nothing but the question and the cached docs, so
+        the tag is derived from the question and each docs entry's cache key
+        and timestamp.
+        
+        Args:
+            question (str): The user's question
+            
+        Returns:
+            Optional[str]: The tag, or None if the answer is not fully cached
+        """
+        processed_question = self.question_handler.normalize_question(question)
+        task = self.question_handler.extract_task(processed_question)
+        platforms = self.identify_platforms(processed_question, task)
+        if not platforms or not task:
+            return None
+        stamps = [self.docs_extractor.get_cache_stamp(platform, task) for platform in platforms]
+        if None in stamps:
+            return None
+        key = json.dumps([processed_question, task, list(zip(platforms, stamps))])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+    def touch_session(self, question: str, session_id: Optional[str]) -> None:
+        """
+        Record a question in the query log and its session without answering it
+        
+        Used when the client already holds the answer, so the answer still
+        counts as asked for prefetching and follow-ups still resolve against
+        it. Only cached snippets are stored; nothing is fetched.
+        
+        Args:
+            question (str): The user's question
+            session_id (Optional[str]): Client conversation session ID
+        """
+        session = self.sessions.get(session_id) if session_id else None
+        processed_question = self.question_handler.normalize_question(question)
+        task = self.question_handler.extract_task(processed_question)
+        platforms = self.identify_platforms(processed_question, task)
+        from_session = False
+        if not platforms and session and session.platform:
+            platforms = [session.platform]
+            from_session = True
+        if not platforms:
+            return
+        if not task and session and session.task:
+            task = session.task
+            from_session = True
+        
+        keywords = self.question_handler.extract_keywords(processed_question)
+        for p in platforms:
+            self.query_log.record(p, task, keywords)
+        
+        if not session_id:
+            return
+        if len(platforms) > 1 or not task:
+            self.sessions.update(session_id, platforms[0], task)
+            return
+        if from_session and session and (session.platform, session.task) == (platforms[0], task):
+            # The follow-up was answered from the session's own snippets
+            self.sessions.update(session_id, platforms[0], task, session.snippets)
+            return
+        docs = self.docs_extractor._get_cached_docs(platforms[0], task)
+        self.sessions.update(session_id, platforms[0], task, docs)
+
+    def _answer_for_platform(self, platform: str, task: str, docs: Optional[List[Dict]] = None,
+                             session_id: Optional[str] = None, keywords: Optional[List[str]] = None) -> Dict:
+        """
+        Retrieve documentation for one platform and build its answer
+        
+        Each snippet is cut down to its best passage around the question's
+        keywords and the task's section terms.
+        
+        Args:
+            platform (str): The CDP platform
+            task (str): The task type
+            docs (Optional[List[Dict]]): Already retrieved snippets to answer from
+            session_id (Optional[str]): Session to remember the answer's snippets in
+            keywords (Optional[List[str]]): Keywords of the question
+            
+        Returns:
+            Dict: Contains the answer, its passages with highlight spans, and
+            any relevant metadata
+        """
+        # Get relevant documentation
+        if docs is None:
             try:
                 docs = self.docs_extractor.get_relevant_docs(platform, task)
-            except Exception as e:
-                # Handle documentation fetch errors
+            except BulkheadFull:
+                # The platform's docs site is backed up; answer now instead of queueing
                 return {
                     'platform': platform,
                     'task': task,
                     'answer': self._get_fallback_response(platform, task),
-                    'error': 'docs_fetch_error'
+                    'error': 'platform_busy'
                 }
-            
-            if not docs:
+            except Exception as e:
+                # Handle documentation fetch errors
                 return {
                     'platform': platform,
                     'task': task,
                     'answer': self._get_fallback_response(platform, task),
-                    'error': 'no_docs_found'
+                    'error': 'docs_fetch_error'
                 }
-            
-            # Format the response
-            response = {
+        
+        if not docs:
+            return {
                 'platform': platform,
                 'task': task,
-                'answer': self.format_answer(docs),
-                'source_url': self.cdp_platforms.get(platform, '')
+                'answer': self._get_fallback_response(platform, task),
+                'error': 'no_docs_found'
             }
+        
+        self.sessions.update(session_id, platform, task, docs)
+        
+        # The platform's own name matches everywhere in its docs, so it is not a passage term
+        sections = self.docs_extractor.task_mappings.get(task, {}).get(platform, [])
+        keys = term_keys((keywords or []) + sections) - term_keys([platform])
+        passages = [passage_for(doc, keys) for doc in docs]
+        
+        # Format the response
+        return {
+            'platform': platform,
+            'task': task,
+            'answer': self.format_answer(passages),
+            'passages': passages,
+            'source_url': self.cdp_platforms.get(platform, '')
+        }
+
+    def get_comparison(self, platforms: List[str], task: str, keywords: Optional[List[str]] = None) -> Dict:
+        """
+        Answer the same task for several platforms side by side
+        
+        Documentation for every platform is retrieved concurrently, so the
+        total wait is bounded by the slowest platform rather than the sum.
+        
+        Args:
+            platforms (List[str]): The CDP platforms to compare
+            task (str): The task type
+            keywords (Optional[List[str]]): Keywords of the question
             
-            return response
-            
-        except Exception as e:
-            return {
-                'answer': "I apologize, but I encountered an error while processing your question. Please try rephrasing it or ask something else.",
-                'error': 'general_error'
-            }
+        Returns:
+            Dict: Contains one section per platform with its own status and latency
+        """
+        def timed_answer(platform: str) -> Dict:
+            start = time.perf_counter()
+            section = self._answer_for_platform(platform, task, keywords=keywords)
+            section['status'] = section.get('error', 'ok')
+            section['latency_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            return section
+        
+        # Each worker runs in a copy of the caller's context so fetch priority,
+        # debug tracing and request profiling carry over into the pool threads
+        contexts = [contextvars.copy_context() for _ in platforms]
+        with ThreadPoolExecutor(max_workers=len(platforms)) as executor:
+            sections = list(executor.map(
+                lambda context, platform: context.run(profiled, timed_answer, platform), contexts, platforms
+            ))
+        
+        return {
+            'platforms': platforms,
+            'task': task,
+            'answer': f"Here's how {', '.join(platforms[:-1])} and {platforms[-1]} compare:",
+            'comparison': sections
+        }
+
+    def suggestion_phrases(self) -> Iterator[Suggestion]:
+        """
+        Phrases for the typeahead index
+        
+        Yields a question template for every supported platform and task,
+        weighted by how often the pair was asked recently, and every parsed
+        documentation heading that, phrased as a question, resolves to a known
+        task. Only phrases that resolve to exactly their own platform and task
+        are suggested (e.g. "segment" in a Lytics question also names Segment).
+        
+        Returns:
+            Iterator[Suggestion]: Suggestions to index
+        """
+        popularity = dict(self.query_log.top_pairs(limit=100))
+        for platform, task in self.docs_extractor.get_combinations():
+            name = PLATFORM_NAMES.get(platform, platform)
+            for template in TASK_PHRASES.get(task, []):
+                question = template.format(platform=name)
+                if self._resolves_to(question, platform, task):
+                    yield Suggestion(question, platform, task,
+                                     weight=1 + popularity.get((platform, task), 0))
+        
+        for platform, heading in self.docs_extractor.corpus_headings():
+            question = f"{heading} in {PLATFORM_NAMES.get(platform, platform)}"
+            task = self.question_handler.extract_task(self.question_handler.normalize_question(question))
+            if task in TASK_PHRASES and self._resolves_to(question, platform, task):
+                yield Suggestion(question, platform, task, weight=0.5)
+
+    def _resolves_to(self, question: str, platform: str, task: str) -> bool:
+        """Check that a question is answered for exactly this platform and task"""
+        processed_question = self.question_handler.normalize_question(question)
+        return (self.identify_platforms(processed_question) == [platform]
+                and self.question_handler.extract_task(processed_question) == task)
 
     def identify_platform(self, question: str) -> str:
         """
@@ -93,10 +324,43 @@ class Chatbot:
         Returns:
             str: The identified platform name
         """
-        for platform in self.cdp_platforms.keys():
-            if platform.lower() in question.lower():
-                return platform
-        return None
+        platforms = self.identify_platforms(question)
+        return platforms[0] if platforms else None
+
+    def identify_platforms(self, question: str, task: Optional[str] = None) -> List[str]:
+        """
+        Identify every CDP platform mentioned in the question
+        
+        Platform names only match as whole words. "segment" is also the noun
+        for an audience segment: when another platform is named, or the task
+        is audience_segment, "a segment", "build segment" and the like are
+        task vocabulary rather than the Segment platform.
+        
+        Args:
+            question (str): The processed question
+            task (Optional[str]): The question's task, if already extracted
+            
+        Returns:
+            List[str]: Platform names in the order they are mentioned
+        """
+        question = question.lower()
+        positions = {
+            platform: [match.start() for match in re.finditer(rf'\b{re.escape(platform.lower())}\b', question)]
+            for platform in self.cdp_platforms.keys()
+        }
+        if positions.get('segment'):
+            others = any(found for platform, found in positions.items() if platform != 'segment')
+            if task is None:
+                task = self.question_handler.extract_task(question)
+            if others or task == 'audience_segment':
+                positions['segment'] = [
+                    position for position in positions['segment']
+                    if not SEGMENT_NOUN_CONTEXT.search(question[:position])
+                ]
+        return sorted(
+            (platform for platform, found in positions.items() if found),
+            key=lambda platform: positions[platform][0]
+        )
 
     def format_answer(self, docs: List[Dict]) -> str:
         """
@@ -1,23 +1,55 @@
-from typing import Dict, List, Optional
-import requests
-from bs4 import BeautifulSoup
-import re
-from .platform_extractors.segment_extractor import SegmentExtractor
-from .platform_extractors.mparticle_extractor import MParticleExtractor
-from .platform_extractors.lytics_extractor import LyticsExtractor
-from .platform_extractors.zeotap_extractor import ZeotapExtractor
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future
+import logging
+import os
+import threading
+import time
+import zlib
+from .bulkhead import Bulkheads, BulkheadFull
+from .fetch_scheduler import PRIORITY_BACKGROUND, fetch_priority
+from .fetch_trace import current_trace
+from .link_health import link_health
+from .passages import token_spans
+from .platform_extractors.registry import ExtractorRegistry
+from .shared_cache import SharedFileCache
+from .snapshot import DEFAULT_SNAPSHOT_PATH, SnapshotReader, write_snapshot
+from .snippet import Snippet
+
+logger = logging.getLogger(__name__)
+
+def shared_docs_key(platform: str, task: str) -> str:
+    """Key of a platform and task's docs in the shared cache"""
+    return f"docs_{platform}_{task}"
 
 class DocsExtractor:
-    def __init__(self):
-        self.extractors = {
-            'segment': SegmentExtractor(),
-            'mparticle': MParticleExtractor(),
-            'lytics': LyticsExtractor(),
-            'zeotap': ZeotapExtractor()
-        }
+    def __init__(self, shared_cache_dir: Optional[str] = None, snapshot_path: Optional[str] = None):
+        # Extractors are imported and instantiated on first use per platform
+        self.extractors = ExtractorRegistry()
         
-        # Cache for storing documentation content
+        # Cache for storing documentation content, keyed by (platform, task)
         self.docs_cache = {}
+        # Cache for free-text search results, keyed by (query, platform)
+        self.search_cache = {}
+        # Guards writes to and iteration over both caches; single lookups are atomic
+        self._lock = threading.Lock()
+        # Extractions in progress by (platform, task); concurrent misses share one
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        # Extractions run in a bounded pool per platform, so a slow docs site
+        # can only tie up its own share of the serving threads
+        self.bulkheads = Bulkheads()
+        self.cache_duration = 24 * 60 * 60  # 24 hours in seconds
+        
+        # Optional on-disk cache shared by every worker process on the host
+        shared_cache_dir = shared_cache_dir or os.environ.get('CHATBOT_SHARED_CACHE_DIR')
+        self.shared_cache = (
+            SharedFileCache(shared_cache_dir, self.cache_duration) if shared_cache_dir else None
+        )
+        
+        # Memory-mapped corpus snapshot that serves answers before any crawl
+        self.snapshot = None
+        snapshot_path = snapshot_path or os.environ.get('CHATBOT_SNAPSHOT', DEFAULT_SNAPSHOT_PATH)
+        if os.path.exists(snapshot_path):
+            self.load_snapshot(snapshot_path)
         
         # Mapping of common tasks to relevant documentation sections
         self.task_mappings = {
@@ -47,20 +79,151 @@ class DocsExtractor:
             }
         }
 
-    def get_relevant_docs(self, platform: str, task: str) -> List[Dict]:
+    def get_relevant_docs(self, platform: str, task: str, force_refresh: bool = False) -> List[Snippet]:
         """
         Get relevant documentation for a specific platform and task
         
         Args:
             platform (str): The CDP platform name
             task (str): The task type
+            force_refresh (bool): Re-extract even if a fresh cached copy exists
             
         Returns:
-            List[Dict]: List of relevant documentation snippets
+            List[Snippet]: List of relevant documentation snippets
+            
+        Raises:
+            BulkheadFull: If the platform already has too many extractions
+            waiting, or this one did not finish in time
         """
         if not platform or not task:
             return []
 
+        # Serve from the in-memory cache when the entry is still fresh
+        trace = current_trace()
+        cached = None if force_refresh else self._get_cached_docs(platform, task)
+        if cached is not None:
+            if trace:
+                trace.set_answer_cache(platform, 'memory')
+            return cached
+
+        if platform not in self.extractors:
+            return []
+
+        snapshot = None if force_refresh else self._fresh_snapshot()
+        if snapshot is not None:
+            docs = snapshot.get_docs(platform, task)
+            if docs:
+                if trace:
+                    trace.set_answer_cache(platform, 'snapshot')
+                # Snapshot content ages from its export, not from when it was read
+                with self._lock:
+                    self.docs_cache[(platform, task)] = (snapshot.metadata['created'], docs)
+                return docs
+
+        # Concurrent misses for the same answer wait for one extraction and share its result
+        key = (platform, task)
+        bulkhead = self.bulkheads[platform]
+        with bulkhead.admit():
+            with self._lock:
+                # Look again under the lock: an extraction may have finished since the first lookup
+                cached = None if force_refresh else self._get_cached_docs(platform, task)
+                flight = self._in_flight.get(key)
+                leader = cached is None and flight is None
+                if leader:
+                    flight = self._in_flight[key] = bulkhead.submit(self._load_docs, platform, task, force_refresh)
+            if leader:
+                flight.add_done_callback(lambda done: self._land(key, done))
+            docs, source = (cached, 'memory') if cached is not None else bulkhead.wait(flight)
+        
+        if trace:
+            trace.set_answer_cache(platform, source if leader else 'memory')
+        return docs
+
+    def _land(self, key: Tuple[str, str], flight: Future) -> None:
+        """Forget a finished extraction; its result is in the cache by now"""
+        with self._lock:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+
+    def _load_docs(self, platform: str, task: str, force_refresh: bool) -> Tuple[List[Snippet], str]:
+        """
+        Extract docs for a cache miss, through the shared cache when configured
+        
+        Args:
+            platform (str): The CDP platform name
+            task (str): The task type
+            force_refresh (bool): Ignore the shared cache's current entry
+            
+        Returns:
+            Tuple[List[Snippet], str]: The snippets and where they came from
+            ('miss' or 'shared')
+        """
+        source = 'miss'
+        if self.shared_cache is None:
+            docs = self._extract_docs(platform, task)
+        else:
+            # Only one worker crawls a missing entry; the others wait and reuse it
+            key = shared_docs_key(platform, task)
+            docs = None if force_refresh else self._get_shared_docs(key)
+            if docs is None:
+                with self.shared_cache.lock(key):
+                    docs = None if force_refresh else self._get_shared_docs(key)
+                    if docs is None:
+                        docs = self._extract_docs(platform, task)
+                        if docs:
+                            self.shared_cache.set(key, [doc.to_dict() for doc in docs])
+                    else:
+                        source = 'shared'
+            else:
+                source = 'shared'
+        
+        if docs:
+            with self._lock:
+                self.docs_cache[(platform, task)] = (time.time(), docs)
+        return docs, source
+
+    def load_shared_docs(self, platform: str, task: str) -> Optional[List[Snippet]]:
+        """
+        Replace the in-memory docs for a platform and task with the shared cache's copy
+        
+        Lets a worker adopt an entry another worker has just refreshed
+        without crawling it again.
+        
+        Args:
+            platform (str): The CDP platform name
+            task (str): The task type
+            
+        Returns:
+            Optional[List[Snippet]]: The shared snippets, or None if there are none
+        """
+        if self.shared_cache is None:
+            return None
+        key = shared_docs_key(platform, task)
+        age = self.shared_cache.age(key)
+        docs = self._get_shared_docs(key)
+        if not docs:
+            return None
+        # Keep the shared entry's age so every worker sees it expire at the same time
+        with self._lock:
+            self.docs_cache[(platform, task)] = (time.time() - (age or 0), docs)
+        return docs
+
+    def _get_shared_docs(self, key: str) -> Optional[List[Snippet]]:
+        """Read snippets from the shared cache, converting them from the dict format"""
+        docs = self.shared_cache.get(key)
+        return None if docs is None else [Snippet.from_dict(doc) for doc in docs]
+
+    def _extract_docs(self, platform: str, task: str) -> List[Snippet]:
+        """
+        Run the platform extractor for a task and process its snippets
+        
+        Args:
+            platform (str): The CDP platform name
+            task (str): The task type
+            
+        Returns:
+            List[Snippet]: Processed documentation snippets
+        """
         # Get the appropriate extractor
         extractor = self.extractors.get(platform)
         if not extractor:
@@ -69,12 +232,127 @@ class DocsExtractor:
         # Get relevant documentation sections based on task
         relevant_sections = self.task_mappings.get(task, {}).get(platform, [])
         
+        trace = current_trace()
+        if trace:
+            base_url = extractor.get_base_url().rstrip('/')
+            trace.expect_urls(platform, [base_url + path for path in getattr(extractor, 'doc_sections', {}).get(task, [])])
+        
         # Use platform-specific extractor to get documentation
         docs = extractor.extract_docs(task, relevant_sections)
+        if trace:
+            trace.count_snippets(platform, docs)
         
         return self._process_docs(docs)
 
-    def _process_docs(self, docs: List[Dict]) -> List[Dict]:
+    def _get_cached_docs(self, platform: str, task: str) -> Optional[List[Snippet]]:
+        """
+        Return cached documentation for a platform and task if it has not expired
+        
+        Args:
+            platform (str): The CDP platform name
+            task (str): The task type
+            
+        Returns:
+            Optional[List[Snippet]]: Cached documentation snippets, or None
+        """
+        entry = self.docs_cache.get((platform, task))
+        if not entry:
+            return None
+        timestamp, docs = entry
+        if time.time() - timestamp >= self.cache_duration:
+            return None
+        return docs
+
+    def get_cache_age(self, platform: str, task: str) -> Optional[float]:
+        """
+        Return how many seconds ago a platform and task were cached in memory
+        
+        Args:
+            platform (str): The CDP platform name
+            task (str): The task type
+            
+        Returns:
+            Optional[float]: Age in seconds, or None if not cached
+        """
+        entry = self.docs_cache.get((platform, task))
+        return time.time() - entry[0] if entry else None
+
+    def get_cache_stamp(self, platform: str, task: str) -> Optional[float]:
+        """
+        Return when the fresh in-memory entry for a platform and task was cached
+        
+        Args:
+            platform (str): The CDP platform name
+            task (str): The task type
+            
+        Returns:
+            Optional[float]: Cache timestamp, or None if not cached or expired
+        """
+        entry = self.docs_cache.get((platform, task))
+        if not entry or time.time() - entry[0] >= self.cache_duration:
+            return None
+        return entry[0]
+
+    def get_combinations(self) -> List[Tuple[str, str]]:
+        """
+        List every (platform, task) pair that has a documentation mapping
+        
+        Returns:
+            List[Tuple[str, str]]: All supported platform and task combinations
+        """
+        return [
+            (platform, task)
+            for task, platforms in self.task_mappings.items()
+            for platform in platforms
+            if platform in self.extractors
+        ]
+
+    def corpus_headings(self) -> List[Tuple[str, str]]:
+        """
+        List the section headings of every page parsed so far
+        
+        Only extractors that are already loaded are consulted, so this never
+        triggers a fetch.
+        
+        Returns:
+            List[Tuple[str, str]]: Unique (platform, heading) pairs
+        """
+        headings = {}
+        for platform, extractor in self.extractors.loaded().items():
+            for page_headings in list(extractor.page_headings.values()):
+                for heading in page_headings:
+                    headings.setdefault((platform, heading), None)
+        return list(headings)
+
+    def link_report(self) -> Dict:
+        """
+        Report the health of every configured documentation path
+        
+        Configured URLs that failed recently or redirect somewhere else are
+        stale and should be fixed in the extractor's `doc_sections`.
+        
+        Returns:
+            Dict: 'paths' (one entry per platform, task and URL with its
+            state from the negative cache and canonical-URL map), 'states'
+            (count per state) and 'stale' (the entries that are not 'ok')
+        """
+        paths = []
+        for platform in self.extractors:
+            extractor = self.extractors[platform]
+            base_url = extractor.get_base_url().rstrip('/')
+            for task, task_paths in extractor.doc_sections.items():
+                for path in task_paths:
+                    paths.append({'platform': platform, 'task': task, **link_health.status(base_url + path)})
+        states = {}
+        for entry in paths:
+            states[entry['state']] = states.get(entry['state'], 0) + 1
+        return {
+            'paths': paths,
+            'states': states,
+            'stale': [entry for entry in paths if entry['state'] != 'ok']
+        }
+
+    def _process_docs(self, docs: List[Dict]) -> List[Snippet]:
         """
         Process and clean the extracted documentation
         
@@ -82,8 +360,12 @@ class DocsExtractor:
             docs (List[Dict]): Raw documentation snippets
             
         Returns:
-            List[Dict]: Processed documentation snippets
+            List[Snippet]: Processed documentation snippets. Snippets support
+            dict-style access; use ``to_dict()`` where a plain dict is needed.
         """
+        # Imported here so that startup does not pay for bs4 until docs are processed
+        from bs4 import BeautifulSoup
+
         processed_docs = []
         
         for doc in docs:
@@ -93,15 +375,14 @@ class DocsExtractor:
             # Remove extra whitespace
             content = ' '.join(content.split())
             
-            # Add processed content
-            processed_docs.append({
-                'content': content,
-                'relevance': doc.get('relevance', 1.0),
-                'url': doc.get('url', '')
-            })
+            # Add processed content as a compact snippet
+            snippet = Snippet.from_dict(doc)
+            snippet.content = content
+            snippet.token_spans = token_spans(content)
+            processed_docs.append(snippet)
         
         # Sort by relevance
-        processed_docs.sort(key=lambda x: x['relevance'], reverse=True)
+        processed_docs.sort(key=lambda x: x.relevance, reverse=True)
         
         return processed_docs
 
@@ -115,34 +396,114 @@ class DocsExtractor:
         if platform:
             if platform in self.extractors:
                 self.extractors[platform].refresh_cache()
+            with self._lock:
+                for key in [key for key in self.docs_cache if key[0] == platform]:
+                    self.docs_cache.pop(key, None)
         else:
-            for extractor in self.extractors.values():
-                extractor.refresh_cache()
+            for platform_name in self.extractors:
+                self.extractors[platform_name].refresh_cache()
+            with self._lock:
+                self.docs_cache.clear()
+        with self._lock:
+            self.search_cache.clear()
+        
+        if self.shared_cache is not None:
+            for platform_name, task in self.get_combinations():
+                if platform is None or platform_name == platform:
+                    self.shared_cache.delete(shared_docs_key(platform_name, task))
 
-    def search_docs(self, query: str, platform: str = None) -> List[Dict]:
+    def search_docs(self, query: str, platform: str = None, force_refresh: bool = False) -> List[Snippet]:
         """
         Search through documentation using a free-text query
         
         Args:
             query (str): Search query
             platform (str, optional): Limit search to specific platform
+            force_refresh (bool): Search again even if a fresh cached result exists
             
         Returns:
-            List[Dict]: Relevant documentation snippets
+            List[Snippet]: Relevant documentation snippets
         """
+        entry = self.search_cache.get((query, platform))
+        if entry and not force_refresh and time.time() - entry[0] < self.cache_duration:
+            return entry[1]
+        
+        snapshot = None if force_refresh else self._fresh_snapshot()
+        if snapshot is not None:
+            results = snapshot.search(query, platform)
+            if results:
+                with self._lock:
+                    self.search_cache[(query, platform)] = (snapshot.metadata['created'], results)
+                return results
+        
         results = []
+        complete = True
         
         # Determine which platforms to search
         platforms = [platform] if platform else self.extractors.keys()
         
-        # Search each platform
+        # Search each platform; a busy platform is left out rather than waited on
         for p in platforms:
             extractor = self.extractors.get(p)
             if extractor:
-                platform_results = extractor.search(query)
+                try:
+                    platform_results = self.bulkheads[p].run(extractor.search, query)
+                except BulkheadFull:
+                    complete = False
+                    continue
                 results.extend(platform_results)
         
         # Sort results by relevance
         results.sort(key=lambda x: x['relevance'], reverse=True)
         
-        return self._process_docs(results)
+        processed = self._process_docs(results)
+        # Results missing a busy platform are served but not cached
+        if complete:
+            with self._lock:
+                self.search_cache[(query, platform)] = (time.time(), processed)
+        return processed
+
+    def load_snapshot(self, path: str) -> None:
+        """
+        Memory-map a corpus snapshot and serve answers from it
+        
+        A snapshot that cannot be read is logged and ignored, and answers
+        are crawled as usual.
+        
+        Args:
+            path (str): Snapshot file written by ``export_snapshot``
+        """
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+        try:
+            self.snapshot = SnapshotReader(path)
+        except (OSError, ValueError, KeyError, zlib.error) as e:
+            # A truncated or corrupt snapshot must not stop the app from starting
+            logger.error(f"Error loading snapshot {path}: {e}")
+
+    def _fresh_snapshot(self) -> Optional[SnapshotReader]:
+        """Return the loaded snapshot unless its content is past the cache duration"""
+        snapshot = self.snapshot
+        if snapshot is None or time.time() - snapshot.metadata.get('created', 0) >= self.cache_duration:
+            return None
+        return snapshot
+
+    def export_snapshot(self, path: str) -> Dict:
+        """
+        Extract every platform and task answer and write them to a snapshot
+        
+        Args:
+            path (str): Destination file
+            
+        Returns:
+            Dict: The snapshot metadata
+        """
+        answers = []
+        # Offline export waits for slow platforms instead of timing out
+        with fetch_priority(PRIORITY_BACKGROUND):
+            for platform, task in self.get_combinations():
+                docs = self.get_relevant_docs(platform, task)
+                if docs:
+                    answers.append((platform, task, docs))
+        return write_snapshot(path, answers)
@@ -0,0 +1,275 @@
+from typing import Dict, Iterator, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Lower values are served first
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 10
+
+_fetch_priority: ContextVar[int] = ContextVar('fetch_priority', default=PRIORITY_USER)
+
+
+@contextmanager
+def fetch_priority(priority: int) -> Iterator[None]:
+    """
+    Run the enclosed fetches at the given scheduler priority.
+
+    Args:
+        priority (int): PRIORITY_USER or PRIORITY_BACKGROUND.
+    """
+    token = _fetch_priority.set(priority)
+    try:
+        yield
+    finally:
+        _fetch_priority.reset(token)
+
+
+def current_priority() -> int:
+    """Return the fetch priority of the current context."""
+    return _fetch_priority.get()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given as delta-seconds or an HTTP date.
+
+    Args:
+        value (Optional[str]): Header value.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        """Take one token if available."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self) -> float:
+        """Seconds until the next token is available."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class _HostState:
+    def __init__(self, rate: float, burst: float):
+        self.bucket = TokenBucket(rate, burst)
+        self.condition = threading.Condition()
+        self.waiting = []  # heap of (priority, sequence)
+        self.blocked_until = 0.0
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_expires_at = 0.0
+        # Set while one thread fetches robots.txt; the others wait on it
+        self.robots_loading: Optional[threading.Event] = None
+
+
+class FetchScheduler:
+    """
+    Central per-host pacing for documentation fetches.
+
+    Each host gets its own token bucket and a priority queue of waiting
+    fetches, so user-facing requests go ahead of background refreshes.
+    robots.txt rules are cached per host (for `robots_retry_ttl` only when
+    it could not be fetched), and a 429/503 with Retry-After pauses the host
+    until that time has passed.
+    """
+
+    def __init__(self, default_rate: float = 2.0, default_burst: float = 4.0,
+                 host_rates: Optional[Dict[str, float]] = None,
+                 user_agent: str = '*', robots_ttl: float = 24 * 60 * 60,
+                 robots_retry_ttl: float = 5 * 60, robots_timeout: float = 10.0,
+                 max_wait: float = 30.0):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_rates = dict(host_rates or {})
+        self.user_agent = user_agent
+        self.robots_ttl = robots_ttl
+        self.robots_retry_ttl = robots_retry_ttl
+        self.robots_timeout = robots_timeout
+        self.max_wait = max_wait
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def _host(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                rate = self.host_rates.get(host, self.default_rate)
+                state = _HostState(rate, self.default_burst)
+                self._hosts[host] = state
+            return state
+
+    def acquire(self, url: str, priority: Optional[int] = None) -> bool:
+        """
+        Block until the URL's host may be fetched.
+
+        Args:
+            url (str): URL about to be fetched.
+            priority (Optional[int]): Scheduler priority; defaults to the
+                priority set with ``fetch_priority`` (user-facing otherwise).
+
+        Returns:
+            bool: True when the fetch may proceed, False if it would have to
+            wait longer than ``max_wait`` (e.g. after a long Retry-After).
+        """
+        if priority is None:
+            priority = _fetch_priority.get()
+        state = self._host(urlsplit(url).netloc)
+        entry = (priority, next(self._sequence))
+        deadline = time.monotonic() + self.max_wait
+
+        with state.condition:
+            heapq.heappush(state.waiting, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    blocked_for = state.blocked_until - now
+                    if state.waiting[0] == entry and blocked_for <= 0 and state.bucket.try_take():
+                        return True
+                    wait = max(blocked_for, state.bucket.time_until_token(), 0.01)
+                    if now + wait > deadline:
+                        return False
+                    state.condition.wait(timeout=wait)
+            finally:
+                state.waiting.remove(entry)
+                heapq.heapify(state.waiting)
+                state.condition.notify_all()
+
+    def defer(self, url: str, retry_after: Optional[float], default: float = 30.0) -> None:
+        """
+        Pause a host after it answered 429 or 503.
+
+        Args:
+            url (str): URL that was throttled.
+            retry_after (Optional[float]): Seconds from the Retry-After header.
+            default (float): Pause used when the server did not say.
+        """
+        host = urlsplit(url).netloc
+        delay = retry_after if retry_after is not None else default
+        state = self._host(host)
+        with state.condition:
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+            state.condition.notify_all()
+        logger.warning(f"Throttled by {host}; pausing fetches for {delay:.0f}s")
+
+    def can_fetch(self, url: str, session=None, headers: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Check the host's cached robots.txt rules for a URL.
+
+        robots.txt is fetched outside the host's lock, so paced fetches to
+        the host are not held up, and by one thread at a time; the others
+        wait for its result.
+
+        Args:
+            url (str): URL to check.
+            session: Optional requests-compatible session used to fetch robots.txt.
+            headers (Optional[Dict[str, str]]): Request headers (the crawler's
+                User-Agent) for the robots.txt fetch.
+
+        Returns:
+            bool: False only when robots.txt explicitly disallows the URL.
+        """
+        parts = urlsplit(url)
+        state = self._host(parts.netloc)
+        loading, loader = None, False
+        with state.condition:
+            if time.time() < state.robots_expires_at:
+                robots = state.robots
+            elif state.robots_loading is not None:
+                loading = state.robots_loading
+            else:
+                loading = state.robots_loading = threading.Event()
+                loader = True
+        if loading is not None:
+            if loader:
+                self._refresh_robots(state, f"{parts.scheme}://{parts.netloc}/robots.txt", session, headers)
+            else:
+                loading.wait(self.robots_timeout)
+            with state.condition:
+                robots = state.robots
+        return robots is None or robots.can_fetch(self.user_agent, url)
+
+    def _refresh_robots(self, state: _HostState, robots_url: str, session=None,
+                        headers: Optional[Dict[str, str]] = None) -> None:
+        """Fetch robots.txt for a host and publish the result to waiting threads."""
+        robots, fetched = None, False
+        try:
+            robots, fetched = self._load_robots(robots_url, session, headers)
+        finally:
+            with state.condition:
+                if fetched:
+                    state.robots = robots
+                    state.robots_expires_at = time.time() + self.robots_ttl
+                else:
+                    # Keep the last known rules and try again soon
+                    state.robots_expires_at = time.time() + self.robots_retry_ttl
+                loading, state.robots_loading = state.robots_loading, None
+            loading.set()
+
+    def _load_robots(self, robots_url: str, session=None,
+                     headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[RobotFileParser], bool]:
+        """
+        Fetch and parse robots.txt.
+
+        Returns:
+            Tuple[Optional[RobotFileParser], bool]: The rules (None allows
+            everything, as for a 4xx) and whether the host gave a definitive
+            answer; network errors and 5xx are retried after `robots_retry_ttl`.
+        """
+        import requests
+
+        try:
+            response = (session or requests).get(robots_url, headers=headers, timeout=self.robots_timeout)
+        except requests.RequestException as e:
+            logger.warning(f"Could not fetch {robots_url}: {e}")
+            return None, False
+        if response.status_code >= 500:
+            logger.warning(f"Could not fetch {robots_url}: HTTP {response.status_code}")
+            return None, False
+        if response.status_code >= 400:
+            return None, True
+        parser = RobotFileParser(robots_url)
+        parser.parse(response.text.splitlines())
+        return parser, True
+
+
+# Shared by every extractor so limits apply per host across the whole process
+scheduler = FetchScheduler()
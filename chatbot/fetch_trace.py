@@ -0,0 +1,128 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+
+_current_trace: ContextVar[Optional['FetchTrace']] = ContextVar('fetch_trace', default=None)
+
+
+class FetchTrace:
+    """
+    Waterfall of every documentation fetch made while answering one request.
+
+    Offsets are milliseconds from the start of the trace. Extractors process
+    pages one after another, so a page's parse time is the gap between the
+    end of its download and the next fetch (or the end of extraction) on the
+    same platform. Connection setup is pooled inside requests, so connect
+    time is reported as part of ``ttfb_ms`` rather than separately.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.entries: List[Dict] = []
+        self.expected: Dict[str, List[str]] = {}
+        self.snippet_counts: Counter = Counter()
+        self.extraction_end: Dict[str, float] = {}
+        self.answer_cache: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def offset(self, moment: Optional[float] = None) -> float:
+        """Milliseconds between the start of the trace and `moment` (default: now)."""
+        return round(((moment or time.perf_counter()) - self.started) * 1000, 2)
+
+    def add_fetch(self, platform: str, url: str, **fields) -> Dict:
+        """
+        Record one fetch.
+
+        Args:
+            platform (str): Platform whose extractor made the fetch.
+            url (str): URL fetched.
+            **fields: Timing and result fields (start_ms, end_ms, dns_ms, ...).
+
+        Returns:
+            Dict: The recorded entry.
+        """
+        entry = {'platform': platform, 'url': url, **fields}
+        with self._lock:
+            self.entries.append(entry)
+        return entry
+
+    def note_page(self, url: str, **fields) -> None:
+        """Attach extra fields (e.g. parse cache status) to the latest fetch of a URL."""
+        with self._lock:
+            for entry in reversed(self.entries):
+                if entry['url'] == url:
+                    entry.update(fields)
+                    return
+
+    def expect_urls(self, platform: str, urls: Iterable[str]) -> None:
+        """Register the configured doc_sections URLs for a platform."""
+        with self._lock:
+            self.expected.setdefault(platform, []).extend(urls)
+
+    def count_snippets(self, platform: str, docs: Iterable[Dict]) -> None:
+        """Attribute extracted snippets to the page they came from."""
+        with self._lock:
+            self.snippet_counts.update(doc.get('url', '') for doc in docs)
+            self.extraction_end[platform] = time.perf_counter()
+
+    def set_answer_cache(self, platform: str, status: str) -> None:
+        """Record where a platform's answer came from (memory, snapshot, shared or miss)."""
+        with self._lock:
+            self.answer_cache[platform] = status
+
+    def to_dict(self) -> Dict:
+        """
+        Build the waterfall.
+
+        Returns:
+            Dict: Total duration, answer cache status per platform, and one row
+            per configured or fetched URL in start order.
+        """
+        with self._lock:
+            entries = sorted((dict(entry) for entry in self.entries), key=lambda e: e['start_ms'])
+
+            by_platform: Dict[str, List[Dict]] = {}
+            for entry in entries:
+                by_platform.setdefault(entry['platform'], []).append(entry)
+            for platform, platform_entries in by_platform.items():
+                end = self.extraction_end.get(platform)
+                end_ms = self.offset(end) if end else None
+                for current, following in zip(platform_entries, platform_entries[1:] + [None]):
+                    parse_until = following['start_ms'] if following else end_ms
+                    current['parse_ms'] = (
+                        round(max(0.0, parse_until - current['end_ms']), 2)
+                        if parse_until is not None else None
+                    )
+                    current['snippets'] = self.snippet_counts.get(current['url'], 0)
+
+            fetched = {entry['url'] for entry in entries}
+            for platform, urls in self.expected.items():
+                for url in urls:
+                    if url not in fetched:
+                        fetched.add(url)
+                        entries.append({'platform': platform, 'url': url, 'cache': 'not_fetched'})
+
+            return {
+                'total_ms': self.offset(),
+                'answer_cache': dict(self.answer_cache),
+                'waterfall': entries
+            }
+
+
+@contextmanager
+def tracing() -> Iterator[FetchTrace]:
+    """Collect a fetch waterfall for everything run inside the block."""
+    trace = FetchTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> Optional[FetchTrace]:
+    """Return the active trace, or None when the request is not being traced."""
+    return _current_trace.get()
@@ -0,0 +1,251 @@
+from typing import Dict, Iterator, List, Optional
+from contextlib import contextmanager
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REDIRECTS_PATH = os.path.join('cache', 'canonical_urls.json')
+# Only permanent redirects are followed directly on later fetches
+PERMANENT_REDIRECTS = (301, 308)
+# Pages that are gone start with a long backoff; other failures (5xx,
+# timeouts) are retried sooner. Each further failure doubles the TTL.
+GONE_STATUSES = (404, 410)
+GONE_TTL = 60 * 60
+FAILURE_TTL = 60
+MAX_TTL = 24 * 60 * 60
+
+
+class LinkHealth:
+    """
+    Remembers which documentation URLs are dead or have moved.
+
+    Failed URLs go into a negative cache and are not fetched again until
+    their TTL expires; the TTL doubles with every consecutive failure up to
+    `max_ttl`. Redirects are recorded in a canonical-URL map, and URLs that
+    moved permanently are fetched at their final location from then on.
+    Both are kept in one JSON file at `path` that every worker process on
+    the host shares: changes are applied to the file's current contents
+    under a file lock, and readers reload it whenever it changes, so a
+    reset from one worker holds for all of them. With no `path` the state
+    is kept in memory. Both feed the admin link report.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_REDIRECTS_PATH, gone_ttl: float = GONE_TTL,
+                 failure_ttl: float = FAILURE_TTL, max_ttl: float = MAX_TTL):
+        self.path = path
+        self.gone_ttl = gone_ttl
+        self.failure_ttl = failure_ttl
+        self.max_ttl = max_ttl
+        self._lock = threading.Lock()
+        # URL -> {'status', 'failures', 'first_failed', 'last_failed', 'retry_at'}
+        self._failures: Dict[str, Dict] = {}
+        # URL -> {'target', 'status', 'recorded'}
+        self._redirects: Dict[str, Dict] = {}
+        # (inode, mtime) of the file version held in memory; every write replaces the inode
+        self._version = None
+        self._sync()
+
+    def _refresh(self) -> None:
+        """Reload the shared state if the file changed since it was last read."""
+        if not self.path:
+            return
+        try:
+            stat = os.stat(self.path)
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            version = None
+        except OSError as e:
+            logger.error(f"Error reading link health state {self.path}: {e}")
+            return
+        if version == self._version and version is not None:
+            return
+        state = self._read() if version is not None else {}
+        self._failures, self._redirects, self._version = (
+            state.get('failures', {}), state.get('redirects', {}), version
+        )
+
+    def _sync(self) -> None:
+        with self._lock:
+            self._refresh()
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading link health state {self.path}: {e}")
+            return {}
+        if 'failures' not in state and 'redirects' not in state:
+            # Files written before failures were shared hold only the redirect map
+            state = {'redirects': state}
+        return state
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if not self.path or fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _update(self) -> Iterator[None]:
+        """Change the latest shared state and write it back, holding the file lock."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            yield
+            self._save()
+
+    def _save(self) -> None:
+        """Atomically replace the state file with the state held in memory."""
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'failures': self._failures, 'redirects': self._redirects},
+                          f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            stat = os.stat(self.path)
+            self._version = (stat.st_ino, stat.st_mtime_ns)
+        except OSError as e:
+            logger.error(f"Error writing link health state {self.path}: {e}")
+
+    def resolve(self, url: str) -> str:
+        """
+        Return the URL to fetch for a configured URL.
+
+        Args:
+            url (str): URL as configured.
+
+        Returns:
+            str: Its final location if it moved permanently, else `url`.
+        """
+        self._sync()
+        redirect = self._redirects.get(url)
+        if redirect and redirect['status'] in PERMANENT_REDIRECTS:
+            return redirect['target']
+        return url
+
+    def is_dead(self, url: str) -> bool:
+        """Whether a URL failed recently and is still within its backoff TTL."""
+        self._sync()
+        failure = self._failures.get(url)
+        return failure is not None and failure['retry_at'] > time.time()
+
+    def record_success(self, url: str, final_url: str, history_statuses: List[int]) -> None:
+        """
+        Note a successful fetch, remembering any redirect it followed.
+
+        Args:
+            url (str): URL as configured.
+            final_url (str): URL the response came from.
+            history_statuses (List[int]): Status codes of the redirect hops.
+        """
+        redirect = None
+        if final_url != url and history_statuses:
+            # The chain is only as permanent as its least permanent hop
+            permanent = all(status in PERMANENT_REDIRECTS for status in history_statuses)
+            status = history_statuses[0] if permanent else next(
+                status for status in history_statuses if status not in PERMANENT_REDIRECTS
+            )
+            redirect = {'target': final_url, 'status': status}
+
+        def changed() -> bool:
+            current = self._redirects.get(url)
+            known = current is not None and redirect is not None and all(
+                current[key] == value for key, value in redirect.items()
+            )
+            return url in self._failures or (redirect is not None and not known)
+
+        # Most fetches change nothing, so only take the file lock when one does
+        self._sync()
+        if not changed():
+            return
+        with self._update():
+            if not changed():
+                return
+            self._failures.pop(url, None)
+            if redirect is not None:
+                self._redirects[url] = {**redirect, 'recorded': time.time()}
+        if redirect is not None:
+            logger.info(f"{url} redirects to {final_url} (HTTP {redirect['status']})")
+
+    def record_failure(self, url: str, status: Optional[int] = None) -> float:
+        """
+        Put a URL in the negative cache, backing off on repeated failures.
+
+        A recorded redirect for the URL is dropped so the next attempt
+        follows the chain from the configured URL again.
+
+        Args:
+            url (str): URL as configured.
+            status (Optional[int]): HTTP status, or None for a network error.
+
+        Returns:
+            float: Seconds until the URL is tried again.
+        """
+        now = time.time()
+        with self._update():
+            failure = self._failures.get(url) or {'failures': 0, 'first_failed': now}
+            failure['failures'] += 1
+            base = self.gone_ttl if status in GONE_STATUSES else self.failure_ttl
+            ttl = min(self.max_ttl, base * 2 ** (failure['failures'] - 1))
+            failure.update(status=status, last_failed=now, retry_at=now + ttl)
+            self._failures[url] = failure
+            self._redirects.pop(url, None)
+        logger.warning(f"Skipping {url} for {ttl:.0f}s after {failure['failures']} failure(s) (status {status})")
+        return ttl
+
+    def reset(self, redirects: bool = False) -> None:
+        """Forget the negative cache, and the redirect map too if `redirects`, in every worker."""
+        with self._update():
+            self._failures = {}
+            if redirects:
+                self._redirects = {}
+
+    def status(self, url: str) -> Dict:
+        """
+        Describe what is known about one URL.
+
+        Args:
+            url (str): URL as configured.
+
+        Returns:
+            Dict: 'url' and 'state' ('dead', 'failing', 'redirected', 'moved'
+            or 'ok'), plus the failure or redirect details when present.
+        """
+        self._sync()
+        entry = {'url': url, 'state': 'ok'}
+        failure = self._failures.get(url)
+        redirect = self._redirects.get(url)
+        if redirect:
+            entry['state'] = 'moved' if redirect['status'] in PERMANENT_REDIRECTS else 'redirected'
+            entry['redirect'] = dict(redirect)
+        if failure:
+            entry['state'] = 'dead' if failure['status'] in GONE_STATUSES else 'failing'
+            entry['failure'] = {
+                **failure, 'retry_in': max(0.0, round(failure['retry_at'] - time.time(), 1))
+            }
+        return entry
+
+
+# Shared by every extractor; CHATBOT_CANONICAL_URLS moves the state file
+link_health = LinkHealth(os.environ.get('CHATBOT_CANONICAL_URLS', DEFAULT_REDIRECTS_PATH))
@@ -0,0 +1,104 @@
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import multiprocessing
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Extractor per platform inside a pool worker process
+_worker_extractors: Dict[str, Any] = {}
+
+
+def _parse_in_worker(platform: str, config: Dict, mode: str, html: str, url: str,
+                     terms: List[str]) -> Tuple[List[Dict], List[str]]:
+    from .platform_extractors.registry import load_extractor_class
+
+    extractor = _worker_extractors.get(platform)
+    if extractor is None:
+        extractor = _worker_extractors[platform] = load_extractor_class(platform)()
+    # Mirror the serving process's extraction config (it can be edited at runtime)
+    for name, value in config.items():
+        setattr(extractor, name, value)
+    page_extract = extractor._extract_page if mode == 'extract_docs' else extractor._search_page
+    results = page_extract(html, url, terms)
+    return results, extractor.page_headings.pop(url, [])
+
+
+class ParsePool:
+    """
+    Optional pool of worker processes that parse documentation pages.
+
+    BeautifulSoup parsing is pure-Python CPU work, so threads serving
+    concurrent questions contend for the GIL. With `workers` > 0 each page
+    is sent to a worker process, which runs the platform's extraction rules
+    and returns only the compact snippet dicts and section headings, never
+    parse trees. Workers are started lazily with the 'spawn' method (forking
+    a threaded server is unsafe). With `workers` = 0 pages are parsed in the
+    calling thread.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = max(0, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def configure(self, workers: int) -> None:
+        """Change the number of worker processes (0 disables offloading)."""
+        self.shutdown()
+        self.workers = max(0, workers)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def parse(self, platform: str, config: Dict, mode: str, html: str, url: str,
+              terms: List[str]) -> Tuple[List[Dict], List[str]]:
+        """
+        Extract a page's snippets in a worker process.
+
+        Args:
+            platform (str): Platform whose extractor parses the page.
+            config (Dict): The extractor's config attributes.
+            mode (str): 'extract_docs' or 'search'.
+            html (str): Page content.
+            url (str): Page URL.
+            terms (List[str]): Section patterns or search keywords.
+
+        Returns:
+            Tuple[List[Dict], List[str]]: Snippets found on the page and its
+            section headings.
+
+        Raises:
+            BrokenProcessPool: If a worker died; the pool is restarted on the
+            next call.
+        """
+        executor = self._pool()
+        try:
+            return executor.submit(_parse_in_worker, platform, config, mode, html, url, terms).result()
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Shared by every extractor in the process; CHATBOT_PARSE_WORKERS enables it
+parse_pool = ParsePool(int(os.environ.get('CHATBOT_PARSE_WORKERS', 0)))
@@ -0,0 +1,136 @@
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+from .platform_extractors.relevance import TOKEN_PATTERN
+
+# Tokens in a passage window (roughly two sentences of documentation)
+PASSAGE_TOKENS = 48
+ELLIPSIS = '…'
+# Shorter question words ("up", "my", "is") are too common to locate a passage
+MIN_TERM_LENGTH = 3
+
+
+def token_spans(content: str) -> array:
+    """
+    Record the character offsets of every word token in a snippet.
+
+    Args:
+        content (str): Snippet text.
+
+    Returns:
+        array: Flat ``[start0, end0, start1, end1, ...]`` offsets.
+    """
+    spans = array('I')
+    for match in TOKEN_PATTERN.finditer(content):
+        spans.append(match.start())
+        spans.append(match.end())
+    return spans
+
+
+def _term_key(token: str) -> str:
+    # Cheap plural folding so "sources" in a heading matches "source" in a question
+    return token[:-1] if len(token) > 3 and token.endswith('s') else token
+
+
+def term_keys(terms: Iterable[str]) -> Set[str]:
+    """Normalize query terms into the keys that ``best_passage`` matches tokens against."""
+    return {
+        _term_key(token) for term in terms for token in TOKEN_PATTERN.findall(term.lower())
+        if len(token) >= MIN_TERM_LENGTH
+    }
+
+
+def best_passage(content: str, spans: array, keys: Set[str],
+                 window: int = PASSAGE_TOKENS) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Cut the densest window of query terms out of a snippet.
+
+    The window of `window` tokens covering the most distinct query terms
+    (then the most matches) wins; it is centered on its matches and marked
+    with an ellipsis where the snippet was cut.
+
+    Args:
+        content (str): Snippet text.
+        spans (array): Token offsets from ``token_spans``.
+        keys (Set[str]): Query terms from ``term_keys``.
+        window (int): Passage length in tokens.
+
+    Returns:
+        Tuple[str, List[Tuple[int, int]]]: Passage text and the
+        ``(start, end)`` character spans of query terms within it.
+    """
+    count = len(spans) // 2
+    if count == 0:
+        return content, []
+    hits, hit_keys = [], []
+    for index in range(count):
+        key = _term_key(content[spans[2 * index]:spans[2 * index + 1]].lower())
+        if key in keys:
+            hits.append(index)
+            hit_keys.append(key)
+
+    if count <= window:
+        first, last = 0, count - 1
+    elif not hits:
+        first, last = 0, window - 1
+    else:
+        # Slide the window start over the matches, keeping per-term counts
+        best, best_start = None, 0
+        terms: Counter = Counter()
+        right = 0
+        for left, start in enumerate(hits):
+            while right < len(hits) and hits[right] < start + window:
+                terms[hit_keys[right]] += 1
+                right += 1
+            score = (len(terms), right - left)
+            if best is None or score > best:
+                best, best_start = score, left
+            terms[hit_keys[left]] -= 1
+            if not terms[hit_keys[left]]:
+                del terms[hit_keys[left]]
+
+        # Center the window on the matches it covers
+        covered = [index for index in hits[best_start:] if index < hits[best_start] + window]
+        lead = (window - (covered[-1] - covered[0] + 1)) // 2
+        first = max(0, min(covered[0] - lead, count - window))
+        last = first + window - 1
+
+    start_char = 0 if first == 0 else spans[2 * first]
+    end_char = len(content) if last == count - 1 else spans[2 * last + 1]
+    prefix = ELLIPSIS if start_char > 0 else ''
+    suffix = ELLIPSIS if end_char < len(content) else ''
+    offset = len(prefix) - start_char
+    highlights = [
+        (spans[2 * index] + offset, spans[2 * index + 1] + offset)
+        for index in hits if first <= index <= last
+    ]
+    return prefix + content[start_char:end_char] + suffix, highlights
+
+
+def passage_for(doc, keys: Set[str], window: int = PASSAGE_TOKENS) -> Dict:
+    """
+    Build the passage result for one retrieved snippet.
+
+    Snippets carry token offsets recorded at extraction; plain dicts are
+    tokenized here.
+
+    Args:
+        doc: Snippet (or snippet dict) to cut a passage from.
+        keys (Set[str]): Query terms from ``term_keys``.
+        window (int): Passage length in tokens.
+
+    Returns:
+        Dict: 'content' (the passage), 'url', 'relevance' and 'highlights'.
+    """
+    spans = getattr(doc, 'token_spans', None)
+    if spans is None:
+        spans = token_spans(doc['content'])
+        if hasattr(doc, 'token_spans'):
+            doc.token_spans = spans
+    text, highlights = best_passage(doc['content'], spans, keys, window)
+    return {
+        'content': text,
+        'url': doc.get('url', ''),
+        'relevance': doc.get('relevance', 0),
+        'highlights': highlights
+    }
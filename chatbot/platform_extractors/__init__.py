@@ -1,11 +1,21 @@
-from .base_extractor import BaseExtractor
-from .segment_extractor import SegmentExtractor
-from .mparticle_extractor import MParticleExtractor
-from .lytics_extractor import LyticsExtractor
-from .zeotap_extractor import ZeotapExtractor
+from .registry import EXTRACTOR_SPECS, ExtractorRegistry, load_extractor_class
+
+# Extractor classes are resolved lazily so that importing the package does not
+# import requests, bs4 or any platform module until an extractor is used.
+_LAZY_CLASSES = {class_name: platform for platform, (_, class_name) in EXTRACTOR_SPECS.items()}
+
+
+def __getattr__(name):
+    if name == 'BaseExtractor':
+        from .base_extractor import BaseExtractor
+        return BaseExtractor
+    if name in _LAZY_CLASSES:
+        return load_extractor_class(_LAZY_CLASSES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'BaseExtractor',
+    'ExtractorRegistry',
     'LyticsExtractor',
     'SegmentExtractor',
     'MParticleExtractor',
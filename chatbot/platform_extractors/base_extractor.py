@@ -1,18 +1,52 @@
-
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import requests
 from bs4 import BeautifulSoup
 import re
 import time
 import json
 import os
+import codecs
+import hashlib
+import heapq
+import inspect
+import itertools
 import logging
+import pickle
+import socket
+import tempfile
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit
+from ..fetch_scheduler import parse_retry_after, scheduler
+from ..link_health import link_health
+from ..parse_pool import parse_pool
+from ..fetch_trace import current_trace
+from .extraction_engine import ExtractionEngine, ExtractionRules, clean_text, compile_rules
+from .streaming import SectionStream
+from .relevance import RelevanceScorer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class BaseExtractor(ABC):
+    # Instance attributes that configure extraction; changing any of them
+    # changes the extractor version and so invalidates memoized page results.
+    CONFIG_ATTRIBUTES = ('base_url', 'doc_sections', 'section_markers', 'content_identifiers', 'rules')
+    # Parsed page results kept per extractor, keyed by (version, URL, content hash, params)
+    PAGE_MEMO_SIZE = 256
+    # Pages larger than STREAM_THRESHOLD bytes are parsed section by section as
+    # they download (None disables streaming). Streaming stops after
+    # STREAM_MAX_SNIPPETS relevant snippets or STREAM_MAX_BYTES of body.
+    STREAM_THRESHOLD: Optional[int] = 1024 * 1024
+    STREAM_MAX_BYTES = 8 * 1024 * 1024
+    STREAM_MAX_SNIPPETS = 40
+    STREAM_SECTION_CHARS = 256 * 1024
+    STREAM_CHUNK_SIZE = 64 * 1024
+    # Section headings remembered per parsed page (used for typeahead suggestions)
+    MAX_PAGE_HEADINGS = 100
+
     def __init__(self):
         self.cache_dir = 'cache'
         self.cache_duration = 24 * 60 * 60  # 24 hours in seconds
@@ -22,10 +56,13 @@ class BaseExtractor(ABC):
                           'AppleWebKit/537.36 (KHTML, like Gecko) '
                           'Chrome/91.0.4472.124 Safari/537.36'
         }
-        
-        # Create cache directory if it doesn't exist
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        self._page_memo: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self._page_memo_lock = threading.Lock()
+        self._code_version: Optional[str] = None
+        # Declarative extraction rules; set by each platform extractor
+        self.rules: Optional[ExtractionRules] = None
+        # URL -> section headings of the last full parse of that page
+        self.page_headings: Dict[str, List[str]] = {}
 
     @abstractmethod
     def get_base_url(self) -> str:
@@ -37,10 +74,9 @@ class BaseExtractor(ABC):
         """Return the platform name."""
         pass
 
-    @abstractmethod
     def extract_docs(self, task: str, relevant_sections: List[str]) -> List[Dict]:
         """
-        Extract documentation for a specific task.
+        Extract documentation for a specific task using the platform's extraction rules.
         
         Args:
             task (str): The task type.
@@ -49,7 +85,30 @@ class BaseExtractor(ABC):
         Returns:
             List[Dict]: List of relevant documentation snippets.
         """
-        pass
+        # Check cache first
+        cached_data = self._get_cached_data(task)
+        if cached_data:
+            return cached_data
+
+        results = []
+        for path in self._doc_paths(task):
+            url = self.base_url.rstrip('/') + path
+            results.extend(self._page_results(url, 'extract_docs', relevant_sections))
+        
+        if results:
+            self._cache_data(task, results)
+        return results
+
+    def _doc_paths(self, task: str) -> List[str]:
+        """Return the documentation paths to extract for a task."""
+        return self.doc_sections.get(task, [])
+
+    @property
+    def engine(self) -> ExtractionEngine:
+        """The compiled extraction engine for this extractor's rules."""
+        if self.rules is None:
+            raise NotImplementedError(f"{type(self).__name__} does not define extraction rules")
+        return compile_rules(self.rules)
 
     def _get_cache_path(self, identifier: str) -> str:
         """Get the cache file path for a given identifier."""
@@ -65,8 +124,14 @@ class BaseExtractor(ABC):
         }
         cache_path = self._get_cache_path(identifier)
         try:
-            with open(cache_path, 'w') as f:
+            # Create cache directory lazily, on the first write
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file and rename it into place, so concurrent
+            # readers and writers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
                 json.dump(cache_content, f)
+            os.replace(tmp_path, cache_path)
             logger.info(f"Cached data for identifier: {identifier}")
         except Exception as e:
             logger.error(f"Error caching data to {cache_path}: {e}")
@@ -102,13 +167,209 @@ class BaseExtractor(ABC):
             Optional[str]: HTML content if successful, None otherwise.
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._polite_get(url)
+            if response is None:
+                return None
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
 
+    def _open_url(self, url: str) -> Optional[requests.Response]:
+        """
+        Send a GET for a URL without reading its body.
+        
+        Args:
+            url (str): URL to fetch.
+            
+        Returns:
+            Optional[requests.Response]: The streaming response, or None on failure.
+            The caller must close it.
+        """
+        response = None
+        try:
+            response = self._polite_get(url, read_body=False)
+            if response is None:
+                return None
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            logger.error(f"Error fetching {url}: {e}")
+            if response is not None:
+                response.close()
+            return None
+
+    def _polite_get(self, url: str, session=None, read_body: bool = True) -> Optional[requests.Response]:
+        """
+        GET a URL through the shared per-host fetch scheduler.
+        
+        Honors the host's robots.txt and token-bucket rate, and pauses the
+        host when it answers 429/503 with Retry-After.
+        
+        Args:
+            url (str): URL to fetch.
+            session: Optional requests session to send the request with.
+            read_body (bool): Download the body before returning. When False the
+                caller streams it with ``iter_content``.
+            
+        Returns:
+            Optional[requests.Response]: The response, or None if the fetch was
+            disallowed, throttled or could not be scheduled in time.
+        """
+        trace = current_trace()
+        if trace is None:
+            return self._scheduled_get(url, session, read_body=read_body)
+
+        # Debug requests record a waterfall entry for every fetch
+        start = time.perf_counter()
+        entry = {'start_ms': trace.offset(start), 'dns_ms': self._time_dns(url), 'cache': 'network'}
+        timings = {}
+        try:
+            response = self._scheduled_get(url, session, timings, read_body)
+        except requests.RequestException as e:
+            trace.add_fetch(self.get_platform_name(), url, **entry, **timings,
+                            end_ms=trace.offset(), status=None, error=str(e))
+            raise
+        trace.add_fetch(self.get_platform_name(), url, **entry, **timings, end_ms=trace.offset())
+        return response
+
+    def _scheduled_get(self, url: str, session=None, timings: Optional[Dict] = None,
+                       read_body: bool = True) -> Optional[requests.Response]:
+        """
+        Send the GET once the scheduler allows it, optionally recording timings.
+        
+        URLs in the negative cache are skipped, URLs known to have moved
+        permanently are fetched at their final location, and the outcome is
+        recorded for the admin link report.
+        
+        Args:
+            url (str): URL to fetch.
+            session: Optional requests session to send the request with.
+            timings (Optional[Dict]): Filled with queue, TTFB and download times,
+                byte count and status when given.
+            read_body (bool): Download the body before returning.
+            
+        Returns:
+            Optional[requests.Response]: The response, or None if the fetch was
+            disallowed, throttled or could not be scheduled in time.
+        """
+        timings = {} if timings is None else timings
+        if link_health.is_dead(url):
+            logger.info(f"Skipping {url}: failed recently")
+            timings['status'] = 'negative_cached'
+            return None
+        fetch_url = link_health.resolve(url)
+        if fetch_url != url:
+            timings['canonical_url'] = fetch_url
+        if not scheduler.can_fetch(fetch_url, session, self.headers):
+            logger.warning(f"Skipping {fetch_url}: disallowed by robots.txt")
+            timings['status'] = 'robots_disallowed'
+            return None
+        queued = time.perf_counter()
+        if not scheduler.acquire(fetch_url):
+            logger.warning(f"Skipping {fetch_url}: host is rate limited")
+            timings['status'] = 'rate_limited'
+            return None
+        sent = time.perf_counter()
+        timings['queue_ms'] = round((sent - queued) * 1000, 2)
+
+        # Streaming separates time-to-first-byte from the body download
+        try:
+            response = (session or requests).get(fetch_url, headers=self.headers, timeout=10, stream=True)
+        except requests.RequestException:
+            link_health.record_failure(url)
+            raise
+        headers_received = time.perf_counter()
+        timings['ttfb_ms'] = round((headers_received - sent) * 1000, 2)
+        timings['status'] = response.status_code
+        if read_body:
+            body = response.content
+            timings['download_ms'] = round((time.perf_counter() - headers_received) * 1000, 2)
+            timings['bytes'] = len(body)
+
+        if response.status_code in (429, 503):
+            scheduler.defer(fetch_url, parse_retry_after(response.headers.get('Retry-After')))
+            logger.error(f"Error fetching {fetch_url}: HTTP {response.status_code}")
+            response.close()
+            return None
+        if response.status_code >= 400:
+            link_health.record_failure(url, response.status_code)
+        else:
+            link_health.record_success(url, response.url, [hop.status_code for hop in response.history])
+        return response
+
+    def _time_dns(self, url: str) -> Optional[float]:
+        """Time a DNS lookup for the URL's host in milliseconds (None if it fails)."""
+        parts = urlsplit(url)
+        start = time.perf_counter()
+        try:
+            socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        except (socket.gaierror, UnicodeError):
+            return None
+        return round((time.perf_counter() - start) * 1000, 2)
+
+    def get_extractor_version(self) -> str:
+        """
+        Fingerprint of this extractor's code and extraction config.
+        
+        The source of every extractor class in the MRO is hashed once; the
+        config attributes are re-hashed on each call so runtime edits to
+        `doc_sections` and friends take effect immediately.
+        
+        Returns:
+            str: Hex digest identifying the extractor version.
+        """
+        if self._code_version is None:
+            digest = hashlib.sha256()
+            for cls in type(self).__mro__:
+                if cls.__module__.startswith(__package__):
+                    try:
+                        digest.update(inspect.getsource(cls).encode('utf-8'))
+                    except (OSError, TypeError):
+                        digest.update(cls.__qualname__.encode('utf-8'))
+            self._code_version = digest.hexdigest()
+
+        config = {name: getattr(self, name, None) for name in self.CONFIG_ATTRIBUTES}
+        config_json = json.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256((self._code_version + config_json).encode('utf-8')).hexdigest()[:16]
+
+    def _memoized_page(self, url: str, html: str, params: Tuple,
+                       extract: Callable[[str], List[Dict]]) -> List[Dict]:
+        """
+        Return extraction results for a page, reusing them if its bytes are unchanged.
+        
+        Args:
+            url (str): Page URL.
+            html (str): Page content.
+            params (Tuple): Hashable extraction parameters (e.g. mode and keywords).
+            extract (Callable[[str], List[Dict]]): Parses the page and returns its snippets.
+            
+        Returns:
+            List[Dict]: Snippets extracted from the page.
+        """
+        content_hash = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        key = (self.get_extractor_version(), url, content_hash, params)
+
+        with self._page_memo_lock:
+            results = self._page_memo.get(key)
+            if results is not None:
+                self._page_memo.move_to_end(key)
+        trace = current_trace()
+        if results is not None:
+            if trace:
+                trace.note_page(url, parse_cache='hit')
+            return [dict(result) for result in results]
+
+        results = extract(html)
+        if trace:
+            trace.note_page(url, parse_cache='miss')
+        with self._page_memo_lock:
+            self._page_memo[key] = results
+            while len(self._page_memo) > self.PAGE_MEMO_SIZE:
+                self._page_memo.popitem(last=False)
+        return [dict(result) for result in results]
+
     def _extract_text_from_html(self, html: str) -> str:
         """
         Extract clean text from HTML content.
@@ -125,13 +386,7 @@ class BaseExtractor(ABC):
         for script in soup(["script", "style"]):
             script.decompose()
         
-        # Get text and clean it up
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        return text
+        return clean_text(soup.get_text())
 
     def _calculate_relevance(self, content: str, keywords: List[str]) -> float:
         """
@@ -147,17 +402,30 @@ class BaseExtractor(ABC):
         if not keywords:
             return 0.0
 
-        content = content.lower()
-        score = 0
-        for keyword in keywords:
-            # Prioritize exact matches
-            count = len(re.findall(rf'\b{re.escape(keyword.lower())}\b', content))
-            score += 1 - (0.5 ** count)
-        return min(score / len(keywords), 1.0) if keywords else 0.0
+        return RelevanceScorer(keywords).score_batch([content])[0]
+
+    def _calculate_relevance_batch(self, contents: List[str], keywords: List[str]) -> List[float]:
+        """
+        Calculate relevance scores for a batch of snippets in one pass.
+        
+        Each snippet is tokenized once and scored against all keywords, giving
+        the same values as calling ``_calculate_relevance`` per snippet.
+        
+        Args:
+            contents (List[str]): Contents to analyze.
+            keywords (List[str]): Keywords to match.
+            
+        Returns:
+            List[float]: Relevance score between 0 and 1 for each content.
+        """
+        if not keywords:
+            return [0.0] * len(contents)
+
+        return RelevanceScorer(keywords).score_batch(contents)
 
     def search(self, query: str) -> List[Dict]:
         """
-        Search documentation using a free-text query.
+        Search every configured documentation page using a free-text query.
         
         Args:
             query (str): Search query.
@@ -165,23 +433,277 @@ class BaseExtractor(ABC):
         Returns:
             List[Dict]: Relevant documentation snippets.
         """
+        # First try to get cached search results
+        cache_key = f"search_{hash(query)}"
+        cached_results = self._get_cached_data(cache_key)
+        if cached_results:
+            return cached_results
+
+        results = []
         keywords = query.lower().split()
-        cached_data = self._get_cached_data('full_docs')
+        for task, paths in self.doc_sections.items():
+            for path in paths:
+                url = self.base_url.rstrip('/') + path
+                results.extend(self._page_results(url, 'search', keywords))
+        
+        results.sort(key=lambda x: x['relevance'], reverse=True)
+        self._cache_data(cache_key, results)
+        return results
+
+    def _page_results(self, url: str, mode: str, terms: List[str]) -> List[Dict]:
+        """
+        Fetch one page and extract its snippets.
         
-        if not cached_data:
+        Pages up to STREAM_THRESHOLD bytes are parsed whole, reusing memoized
+        results when their content is unchanged. Larger pages are streamed
+        through ``_stream_page`` so they are never held in memory at once.
+        
+        Args:
+            url (str): Page URL.
+            mode (str): 'extract_docs' (terms are relevant sections) or 'search'
+                (terms are keywords).
+            terms (List[str]): Section patterns or search keywords.
+            
+        Returns:
+            List[Dict]: Snippets found on the page.
+        """
+        page_extract = self._extract_page if mode == 'extract_docs' else self._search_page
+        params = (mode, tuple(terms))
+        extract = lambda html: page_extract(html, url, terms)
+        if parse_pool.enabled:
+            extract = lambda html: self._offloaded_page(html, url, mode, terms)
+        
+        if self.STREAM_THRESHOLD is None:
+            content = self._fetch_url(url)
+            return self._memoized_page(url, content, params, extract) if content else []
+        
+        response = self._open_url(url)
+        if response is None:
+            return []
+        trace = current_trace()
+        download = {'seconds': 0.0, 'finished': time.perf_counter()}
+        try:
+            chunks = response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+            if trace:
+                # The body is read here rather than in _polite_get, so time it here
+                chunks = self._timed_chunks(chunks, download)
+            head, size = [], 0
+            for chunk in chunks:
+                head.append(chunk)
+                size += len(chunk)
+                if size > self.STREAM_THRESHOLD:
+                    break
+            else:
+                # The whole page fit under the threshold
+                if trace:
+                    trace.note_page(url, bytes=size, download_ms=round(download['seconds'] * 1000, 2),
+                                    end_ms=trace.offset(download['finished']))
+                content = self._decoder(response.encoding).decode(b''.join(head), final=True)
+                return self._memoized_page(url, content, params, extract) if content else []
+            results = self._stream_page(url, itertools.chain(head, chunks), self._decoder(response.encoding), mode, terms)
+            if trace:
+                # Parsing is interleaved with the download, so only the reads are counted
+                trace.note_page(url, download_ms=round(download['seconds'] * 1000, 2),
+                                end_ms=trace.offset(download['finished']))
+            return results
+        except requests.RequestException as e:
+            logger.error(f"Error reading {url}: {e}")
             return []
+        finally:
+            response.close()
+
+    def _timed_chunks(self, chunks: Iterable[bytes], download: Dict) -> Iterator[bytes]:
+        """
+        Yield body chunks, adding the time spent waiting for each one to ``download['seconds']``.
+        
+        ``download['finished']`` is set to the moment the latest chunk arrived.
+        """
+        chunks = iter(chunks)
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            finally:
+                download['finished'] = time.perf_counter()
+                download['seconds'] += download['finished'] - started
+            yield chunk
+
+    def _offloaded_page(self, html: str, url: str, mode: str, terms: List[str]) -> List[Dict]:
+        """
+        Extract a page in the parse pool's worker processes.
+        
+        Falls back to parsing in this thread if the pool is unavailable.
+        
+        Args:
+            html (str): Page content.
+            url (str): Page URL.
+            mode (str): 'extract_docs' or 'search'.
+            terms (List[str]): Section patterns or search keywords.
+            
+        Returns:
+            List[Dict]: Snippets found on the page.
+        """
+        config = {name: getattr(self, name) for name in self.CONFIG_ATTRIBUTES if hasattr(self, name)}
+        try:
+            results, headings = parse_pool.parse(self.get_platform_name(), config, mode, html, url, terms)
+        except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+            logger.error(f"Parse pool unavailable for {url}, parsing in process: {e}")
+            page_extract = self._extract_page if mode == 'extract_docs' else self._search_page
+            return page_extract(html, url, terms)
+        self.page_headings[url] = headings
+        return results
+
+    def _decoder(self, encoding: Optional[str]) -> codecs.IncrementalDecoder:
+        """Incremental decoder for a response's declared encoding (UTF-8 if unknown)."""
+        try:
+            return codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def _stream_page(self, url: str, chunks: Iterable[bytes], decoder: codecs.IncrementalDecoder,
+                     mode: str, terms: List[str]) -> List[Dict]:
+        """
+        Extract snippets from a page while it downloads.
+        
+        The body is fed chunk by chunk into a ``SectionStream``; every heading
+        section is extracted with the platform's rules as soon as it completes
+        and then discarded. Reading stops once STREAM_MAX_SNIPPETS relevant
+        snippets were found or STREAM_MAX_BYTES were read. When the rules
+        declare fallback content, the best fallback snippets are kept (up to
+        STREAM_MAX_SNIPPETS) and used only if no heading matched.
         
+        Args:
+            url (str): Page URL.
+            chunks (Iterable[bytes]): Body chunks.
+            decoder (codecs.IncrementalDecoder): Decoder for the body.
+            mode (str): 'extract_docs' or 'search'.
+            terms (List[str]): Section patterns or search keywords.
+            
+        Returns:
+            List[Dict]: Snippets found on the page.
+        """
+        engine = self.engine
+        stream = SectionStream(engine.heading_tags, self.STREAM_SECTION_CHARS)
+        results: List[Dict] = []
+        fallback: List[Dict] = []
+        read = 0
+        stopped = 'end'
+        
+        def consume(sections: List[str]) -> None:
+            nonlocal fallback
+            for section in sections:
+                if len(results) >= self.STREAM_MAX_SNIPPETS:
+                    return
+                root = engine.parse(section)
+                if mode == 'search':
+                    elements = engine.search_elements(root)
+                else:
+                    elements = engine.section_elements(root, terms, use_fallback=False)
+                results.extend(self._score_snippets(engine.snippets(elements), url, terms))
+                if mode != 'search' and not results and engine.fallback_content is not None:
+                    candidates = self._score_snippets(engine.snippets(engine.fallback_elements(root)), url, terms)
+                    fallback = heapq.nlargest(self.STREAM_MAX_SNIPPETS, fallback + candidates,
+                                              key=lambda x: x['relevance'])
+        
+        for chunk in chunks:
+            read += len(chunk)
+            stream.feed(decoder.decode(chunk))
+            consume(stream.pop_sections())
+            if len(results) >= self.STREAM_MAX_SNIPPETS:
+                stopped = 'enough_snippets'
+                break
+            if read >= self.STREAM_MAX_BYTES:
+                stopped = 'byte_cap'
+                break
+        
+        if stopped != 'enough_snippets':
+            stream.feed(decoder.decode(b'', final=True))
+            stream.close()
+            consume(stream.pop_sections())
+        
+        if stopped != 'end':
+            logger.info(f"Stopped streaming {url} after {read} bytes ({stopped})")
+        trace = current_trace()
+        if trace:
+            trace.note_page(url, parse_cache='streamed', bytes=read, stream_stop=stopped)
+        return results or fallback
+
+    def _extract_page(self, html: str, url: str, relevant_sections: List[str]) -> List[Dict]:
+        """
+        Extract the snippets under a page's relevant section headings.
+        
+        Args:
+            html (str): Page content.
+            url (str): Page URL.
+            relevant_sections (List[str]): List of relevant section keywords.
+            
+        Returns:
+            List[Dict]: Snippets found on the page.
+        """
+        engine = self.engine
+        elements = engine.section_elements(self._parse_page(html, url), relevant_sections)
+        return self._score_snippets(engine.snippets(elements), url, relevant_sections)
+
+    def _search_page(self, html: str, url: str, keywords: List[str]) -> List[Dict]:
+        """
+        Find snippets matching search keywords anywhere on a page.
+        
+        Args:
+            html (str): Page content.
+            url (str): Page URL.
+            keywords (List[str]): Search keywords.
+            
+        Returns:
+            List[Dict]: Matching snippets found on the page.
+        """
+        engine = self.engine
+        elements = engine.search_elements(self._parse_page(html, url))
+        return self._score_snippets(engine.snippets(elements), url, keywords)
+
+    def _parse_page(self, html: str, url: str):
+        """Parse a whole page with the extraction engine and remember its headings."""
+        root = self.engine.parse(html)
+        self.page_headings[url] = self.engine.heading_texts(root)[:self.MAX_PAGE_HEADINGS]
+        return root
+
+    def _score_snippets(self, snippets: List[Tuple[Any, str]], url: str, keywords: List[str]) -> List[Dict]:
+        """
+        Score a page's snippets in one pass and build results for the relevant ones.
+        
+        Args:
+            snippets (List[Tuple[Any, str]]): (element, text) pairs.
+            url (str): Page URL.
+            keywords (List[str]): Keywords to score against.
+            
+        Returns:
+            List[Dict]: Snippets with a relevance above zero.
+        """
         results = []
-        for doc in cached_data:
-            relevance = self._calculate_relevance(doc['content'], keywords)
+        scores = self._calculate_relevance_batch([text for _, text in snippets], keywords)
+        for (element, text), relevance in zip(snippets, scores):
             if relevance > 0:
-                results.append({
-                    'content': doc['content'],
-                    'url': doc.get('url', ''),
+                result = {
+                    'content': text,
+                    'url': url,
                     'relevance': relevance
-                })
+                }
+                result.update(self._snippet_details(element))
+                results.append(result)
+        return results
+
+    def _snippet_details(self, element) -> Dict:
+        """
+        Extra fields for a relevant snippet; platforms extend this.
         
-        return sorted(results, key=lambda x: x['relevance'], reverse=True)
+        Args:
+            element: BeautifulSoup element of the snippet.
+            
+        Returns:
+            Dict: Example lists declared in the extraction rules.
+        """
+        return self.engine.example_fields(element)
 
     def refresh_cache(self) -> None:
         """Clear the documentation cache."""
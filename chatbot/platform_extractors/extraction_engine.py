@@ -0,0 +1,233 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
+import re
+from bs4 import BeautifulSoup
+from bs4.element import CData, NavigableString, Tag
+import soupsieve
+
+# String types that BeautifulSoup's get_text() includes by default
+TEXT_TYPES = (NavigableString, CData)
+SKIPPED_TEXT_PARENTS = ('script', 'style')
+
+
+def clean_text(text: str) -> str:
+    """
+    Collapse whitespace in extracted page text.
+
+    Args:
+        text (str): Raw text.
+
+    Returns:
+        str: Text with blank lines and runs of spaces collapsed to single spaces.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+
+def element_text(element: Tag) -> str:
+    """
+    Clean text of an element, without script and style contents.
+
+    Reads the strings of the already-parsed element directly, giving the same
+    result as re-parsing ``str(element)`` with ``_extract_text_from_html``.
+
+    Args:
+        element (Tag): Parsed element.
+
+    Returns:
+        str: Clean text.
+    """
+    parts = [
+        string for string in element.descendants
+        if type(string) in TEXT_TYPES and string.parent.name not in SKIPPED_TEXT_PARENTS
+    ]
+    return clean_text(''.join(parts))
+
+
+@lru_cache(maxsize=256)
+def _section_pattern(sections: Tuple[str, ...]) -> Optional[Pattern]:
+    if not sections:
+        return None
+    return re.compile('|'.join(f'(?:{section})' for section in sections), re.IGNORECASE)
+
+
+class ExtractionRules:
+    """
+    Declarative description of how to pull snippets out of a platform's pages.
+
+    Args:
+        section_content (str): CSS selector for the elements collected under a
+            heading that matches one of the task's relevant sections.
+        search_content (str): CSS selector for the elements scored by free-text search.
+        container (Optional[str]): CSS selector for the main content area. The
+            whole page is used when it is not set or not found.
+        headings (str): Comma-separated tag names of the headings that start and
+            end sections.
+        walk (str): 'document' collects every matching element after a heading
+            until the next heading in document order; 'siblings' collects only
+            the heading's following siblings until the next sibling heading.
+        fallback_content (Optional[str]): CSS selector used for the whole
+            container when no heading matched.
+        exclude_mentions (Dict[str, str]): Drop snippets whose text mentions a
+            key, unless it also mentions the key's value.
+        examples (Dict[str, str]): Result field -> CSS selector whose matching
+            blocks inside a snippet are attached as a list of texts.
+    """
+
+    def __init__(self, section_content: str, search_content: str,
+                 container: Optional[str] = None, headings: str = 'h1, h2, h3, h4',
+                 walk: str = 'document', fallback_content: Optional[str] = None,
+                 exclude_mentions: Optional[Dict[str, str]] = None,
+                 examples: Optional[Dict[str, str]] = None):
+        if walk not in ('document', 'siblings'):
+            raise ValueError(f"Unknown walk mode: {walk}")
+        self.section_content = section_content
+        self.search_content = search_content
+        self.container = container
+        self.headings = headings
+        self.walk = walk
+        self.fallback_content = fallback_content
+        self.exclude_mentions = tuple((exclude_mentions or {}).items())
+        self.examples = tuple((examples or {}).items())
+
+    def _key(self) -> Tuple:
+        return (self.section_content, self.search_content, self.container, self.headings,
+                self.walk, self.fallback_content, self.exclude_mentions, self.examples)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ExtractionRules) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return f"ExtractionRules{self._key()!r}"
+
+
+class ExtractionEngine:
+    """
+    Rules compiled into soupsieve selectors and applied in one pass per page.
+
+    Use ``compile_rules`` to get an engine; engines are cached per rule set so
+    every extractor instance with the same rules shares the compiled selectors.
+    """
+
+    def __init__(self, rules: ExtractionRules):
+        self.rules = rules
+        self.headings = soupsieve.compile(rules.headings)
+        self.heading_tags = frozenset(name.strip() for name in rules.headings.split(','))
+        self.section_content = soupsieve.compile(rules.section_content)
+        self.search_content = soupsieve.compile(rules.search_content)
+        self.container = soupsieve.compile(rules.container) if rules.container else None
+        self.fallback_content = soupsieve.compile(rules.fallback_content) if rules.fallback_content else None
+        self.examples = [(field, soupsieve.compile(selector)) for field, selector in rules.examples]
+
+    def parse(self, html: str) -> Tag:
+        """Parse a page and return its content container."""
+        soup = BeautifulSoup(html, 'html.parser')
+        if self.container is not None:
+            return self.container.select_one(soup) or soup
+        return soup
+
+    def section_elements(self, root: Tag, relevant_sections: List[str],
+                         use_fallback: bool = True) -> List[Tag]:
+        """
+        Collect the content elements under headings that match any relevant section.
+
+        The page is traversed once for all sections, and each element is
+        returned at most once, in document order.
+
+        Args:
+            root (Tag): Content container returned by ``parse``.
+            relevant_sections (List[str]): Section patterns (regular expressions).
+            use_fallback (bool): Return the rules' fallback content when no
+                heading matched.
+
+        Returns:
+            List[Tag]: Matching content elements.
+        """
+        pattern = _section_pattern(tuple(relevant_sections))
+        elements = []
+        if pattern is not None:
+            siblings = self.rules.walk == 'siblings'
+            active = False
+            # In siblings mode a heading only opens content at its own level
+            open_parents: Dict[int, bool] = {}
+            for element in root.descendants:
+                if not isinstance(element, Tag):
+                    continue
+                if self.headings.match(element):
+                    matched = element.string is not None and pattern.search(element.string) is not None
+                    if siblings:
+                        open_parents[id(element.parent)] = matched
+                    else:
+                        active = matched
+                    continue
+                if siblings:
+                    if not open_parents.get(id(element.parent)):
+                        continue
+                elif not active:
+                    continue
+                if self.section_content.match(element):
+                    elements.append(element)
+
+        if not elements and use_fallback:
+            elements = self.fallback_elements(root)
+        return elements
+
+    def fallback_elements(self, root: Tag) -> List[Tag]:
+        """Return the rules' fallback content of the container (empty if none is declared)."""
+        if self.fallback_content is None:
+            return []
+        return self.fallback_content.select(root)
+
+    def heading_texts(self, root: Tag) -> List[str]:
+        """Return the clean text of every section heading in the container."""
+        return [text for text in (element_text(heading) for heading in self.headings.select(root)) if text]
+
+    def search_elements(self, root: Tag) -> List[Tag]:
+        """Return every element of the container that free-text search should score."""
+        return self.search_content.select(root)
+
+    def snippets(self, elements: List[Tag]) -> List[Tuple[Tag, str]]:
+        """
+        Pair elements with their clean text, dropping excluded snippets.
+
+        Args:
+            elements (List[Tag]): Candidate elements.
+
+        Returns:
+            List[Tuple[Tag, str]]: (element, text) for each kept snippet.
+        """
+        results = []
+        for element in elements:
+            text = element_text(element)
+            if self.rules.exclude_mentions:
+                lowered = text.lower()
+                if any(term in lowered and unless not in lowered
+                       for term, unless in self.rules.exclude_mentions):
+                    continue
+            results.append((element, text))
+        return results
+
+    def example_fields(self, element: Tag) -> Dict[str, List[str]]:
+        """
+        Collect example blocks (code, configuration, ...) inside a snippet.
+
+        Args:
+            element (Tag): Snippet element; it is included if it matches itself.
+
+        Returns:
+            Dict[str, List[str]]: Non-empty example lists by result field.
+        """
+        fields = {}
+        for field, selector in self.examples:
+            blocks = ([element] if selector.match(element) else []) + selector.select(element)
+            texts = [text for text in (block.get_text().strip() for block in blocks) if text]
+            if texts:
+                fields[field] = texts
+        return fields
+
+
+compile_rules = lru_cache(maxsize=32)(ExtractionEngine)
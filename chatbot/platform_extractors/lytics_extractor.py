@@ -1,9 +1,7 @@
-from typing import Dict, List, Optional
-import requests
-from bs4 import BeautifulSoup
-import re
+from typing import Dict, List
 import logging
 from .base_extractor import BaseExtractor
+from .extraction_engine import ExtractionRules
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -44,6 +42,23 @@ class LyticsExtractor(BaseExtractor):
             'examples': ['Examples', 'Use Cases', 'Implementations']
         }
         
+        # Walk the siblings of matching headers inside the main content area.
+        # Unclassed divs and documentation blocks count as content, and
+        # snippets that look like Segment documentation are skipped.
+        content_divs = 'div:not([class]), div:is(.content, .documentation, .example, .tutorial)'
+        self.rules = ExtractionRules(
+            container='main',
+            walk='siblings',
+            section_content=f'p, ul, ol, pre, code, {content_divs}',
+            search_content=f'p, li, pre, code, {content_divs}',
+            fallback_content='p, div, ul, ol, pre, code',
+            exclude_mentions={'segment': 'lytics'},
+            examples={
+                'code_examples': ':is(pre, code, div):is(.highlight, .code-block, .example)',
+                'configuration_examples': ':is(pre, code, div):is(.configuration, .config, .json, .yaml)'
+            }
+        )
+        
         # Disable caching to always fetch fresh content.
         self.use_cache = False
 
@@ -53,137 +68,21 @@ class LyticsExtractor(BaseExtractor):
     def get_platform_name(self) -> str:
         return 'lytics'
 
-    def extract_docs(self, task: str, relevant_sections: List[str]) -> List[Dict]:
+    def _doc_paths(self, task: str) -> List[str]:
         """
-        Extract documentation for a specific task from Lytics' documentation.
+        For audience segmentation, limit to the primary doc page.
         """
-        # Always bypass cache if caching is disabled.
-        cached_data = self._get_cached_data(task)
-        if cached_data:
-            return cached_data
-
-        results = []
-        
-        # For audience segmentation, limit to the primary doc page.
         if task == 'audience_segment':
-            doc_paths = [self.doc_sections[task][0]]  # Use only '/segments/'
-        else:
-            doc_paths = self.doc_sections.get(task, [])
-        
-        for path in doc_paths:
-            url = self.base_url.rstrip('/') + path
-            page_content = self._fetch_url(url)
-            if not page_content:
-                logger.warning(f"Failed to fetch content from {url}")
-                continue
-            
-            soup = BeautifulSoup(page_content, 'html.parser')
-            container = soup.find('main') or soup  # Prefer main content area
-            
-            # Look for headers matching the relevant sections.
-            relevant_elements = []
-            for section in relevant_sections:
-                headers = container.find_all(
-                    ['h1', 'h2', 'h3', 'h4'],
-                    string=re.compile(section, re.IGNORECASE)
-                )
-                for header in headers:
-                    content_elements = []
-                    current = header.find_next_sibling()
-                    while current and current.name not in ['h1', 'h2', 'h3', 'h4']:
-                        if current.name in ['p', 'ul', 'ol', 'pre', 'code']:
-                            content_elements.append(current)
-                        elif current.name == 'div':
-                            classes = current.get('class', [])
-                            allowed = ['content', 'documentation', 'example', 'tutorial']
-                            if not classes or any(cls in allowed for cls in classes):
-                                content_elements.append(current)
-                        current = current.find_next_sibling()
-                    if content_elements:
-                        relevant_elements.extend(content_elements)
-            
-            # Fallback: If no specific headers were found, extract all content elements.
-            if not relevant_elements:
-                relevant_elements = container.find_all(['p', 'div', 'ul', 'ol', 'pre', 'code'])
-            
-            # Process each found element.
-            for element in relevant_elements:
-                extracted_text = self._extract_text_from_html(str(element))
-                # Skip snippets that seem to be from Segment documentation.
-                if "segment" in extracted_text.lower() and "lytics" not in extracted_text.lower():
-                    continue
-                
-                relevance = self._calculate_relevance(extracted_text, relevant_sections)
-                if relevance > 0:
-                    code_examples = self._extract_code_examples(str(element))
-                    config_examples = self._extract_configuration_examples(str(element))
-                    result = {
-                        'content': extracted_text,
-                        'url': url,
-                        'relevance': relevance,
-                        'section_type': self._identify_section_type(element)
-                    }
-                    if code_examples:
-                        result['code_examples'] = code_examples
-                    if config_examples:
-                        result['configuration_examples'] = config_examples
-                    results.append(result)
-        
-        if results:
-            self._cache_data(task, results)
-        return results
+            return [self.doc_sections[task][0]]  # Use only '/segments/'
+        return self.doc_sections.get(task, [])
 
-    def search(self, query: str) -> List[Dict]:
+    def _snippet_details(self, element) -> Dict:
         """
-        Lytics-specific search implementation.
+        Tag snippets with their section type along with code and configuration examples.
         """
-        cache_key = f"search_{hash(query)}"
-        cached_results = self._get_cached_data(cache_key)
-        if cached_results:
-            return cached_results
-
-        results = []
-        keywords = query.lower().split()
-        
-        for task, paths in self.doc_sections.items():
-            for path in paths:
-                url = self.base_url.rstrip('/') + path
-                page_content = self._fetch_url(url)
-                if not page_content:
-                    logger.warning(f"Failed to fetch content from {url}")
-                    continue
-                
-                soup = BeautifulSoup(page_content, 'html.parser')
-                elements = soup.find_all(['p', 'li', 'pre', 'code', 'div'])
-                for element in elements:
-                    if element.name == 'div':
-                        classes = element.get('class', [])
-                        allowed = ['content', 'documentation', 'example', 'tutorial']
-                        if classes and not any(cls in allowed for cls in classes):
-                            continue
-                    text = self._extract_text_from_html(str(element))
-                    # Skip potential Segment-related snippets in audience_segment search.
-                    if "segment" in text.lower() and "lytics" not in text.lower():
-                        continue
-                    relevance = self._calculate_relevance(text, keywords)
-                    if relevance > 0:
-                        result = {
-                            'content': text,
-                            'url': url,
-                            'relevance': relevance,
-                            'section_type': self._identify_section_type(element)
-                        }
-                        code_examples = self._extract_code_examples(str(element))
-                        config_examples = self._extract_configuration_examples(str(element))
-                        if code_examples:
-                            result['code_examples'] = code_examples
-                        if config_examples:
-                            result['configuration_examples'] = config_examples
-                        results.append(result)
-        
-        results.sort(key=lambda x: x['relevance'], reverse=True)
-        self._cache_data(cache_key, results)
-        return results
+        details = {'section_type': self._identify_section_type(element)}
+        details.update(super()._snippet_details(element))
+        return details
 
     def _identify_section_type(self, element) -> str:
         """
@@ -195,27 +94,3 @@ class LyticsExtractor(BaseExtractor):
                 if marker.lower() in element_text:
                     return section_type
         return 'general'
-
-    def _extract_configuration_examples(self, html_content: str) -> List[str]:
-        """
-        Extract configuration examples from HTML content.
-        """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        config_blocks = []
-        for config in soup.find_all(['pre', 'code', 'div'], class_=['configuration', 'config', 'json', 'yaml']):
-            config_text = config.get_text().strip()
-            if config_text:
-                config_blocks.append(config_text)
-        return config_blocks
-
-    def _extract_code_examples(self, html_content: str) -> List[str]:
-        """
-        Extract code examples from HTML content.
-        """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        code_blocks = []
-        for code in soup.find_all(['pre', 'code', 'div'], class_=['highlight', 'code-block', 'example']):
-            code_text = code.get_text().strip()
-            if code_text:
-                code_blocks.append(code_text)
-        return code_blocks
\ No newline at end of file
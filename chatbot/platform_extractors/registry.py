@@ -0,0 +1,73 @@
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+from collections.abc import Mapping
+from importlib import import_module
+import threading
+
+if TYPE_CHECKING:
+    from .base_extractor import BaseExtractor
+
+# Platform name -> (module, class). Modules are imported only on first use.
+EXTRACTOR_SPECS = {
+    'segment': ('.segment_extractor', 'SegmentExtractor'),
+    'mparticle': ('.mparticle_extractor', 'MParticleExtractor'),
+    'lytics': ('.lytics_extractor', 'LyticsExtractor'),
+    'zeotap': ('.zeotap_extractor', 'ZeotapExtractor')
+}
+
+
+def load_extractor_class(platform: str, specs: Optional[Dict[str, tuple]] = None) -> type:
+    """
+    Import and return the extractor class registered for a platform.
+    
+    Args:
+        platform (str): The platform name.
+        specs (Optional[Dict[str, tuple]]): Platform -> (module, class) specs
+            to resolve it from; defaults to EXTRACTOR_SPECS. Module names may
+            be absolute or relative to this package.
+        
+    Returns:
+        type: The extractor class.
+    """
+    module_name, class_name = (EXTRACTOR_SPECS if specs is None else specs)[platform]
+    module = import_module(module_name, __package__)
+    return getattr(module, class_name)
+
+
+class ExtractorRegistry(Mapping):
+    """
+    Mapping of platform name to extractor that instantiates each extractor lazily.
+    
+    Membership tests and iteration only look at the registered names, so
+    callers can list platforms without importing any platform module.
+    """
+
+    def __init__(self, specs: Optional[Dict[str, tuple]] = None):
+        self._specs = dict(specs or EXTRACTOR_SPECS)
+        self._instances: Dict[str, 'BaseExtractor'] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, platform: str) -> 'BaseExtractor':
+        extractor = self._instances.get(platform)
+        if extractor is not None:
+            return extractor
+        if platform not in self._specs:
+            raise KeyError(platform)
+        with self._lock:
+            extractor = self._instances.get(platform)
+            if extractor is None:
+                extractor = load_extractor_class(platform, self._specs)()
+                self._instances[platform] = extractor
+        return extractor
+
+    def __contains__(self, platform: object) -> bool:
+        return platform in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def loaded(self) -> Dict[str, 'BaseExtractor']:
+        """Return the extractors that have already been instantiated."""
+        return dict(self._instances)
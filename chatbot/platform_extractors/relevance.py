@@ -0,0 +1,115 @@
+from typing import Dict, Iterable, List, Sequence, Tuple
+import re
+
+# Tokens are maximal runs of word characters, which is exactly what a
+# ``\bkeyword\b`` pattern matches when the keyword itself is a single word.
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(content: str) -> List[str]:
+    """
+    Lowercase and split content into word tokens.
+
+    Args:
+        content (str): Content to tokenize.
+
+    Returns:
+        List[str]: Word tokens in document order.
+    """
+    return TOKEN_PATTERN.findall(content.lower())
+
+
+class RelevanceScorer:
+    """
+    Batch keyword scorer equivalent to ``BaseExtractor._calculate_relevance``.
+
+    Every snippet is tokenized once into a sparse row of keyword-column counts
+    (a CSR-style ``{column: count}`` mapping), and the whole batch is scored
+    against all keywords in a single pass over those rows. Keywords that are
+    not a single word token (e.g. ``data-sources``) keep the original
+    ``\\b...\\b`` regex semantics so scores stay identical.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = [keyword.lower() for keyword in keywords]
+        self.columns: Dict[str, int] = {}
+        self.regex_columns: List[Tuple[int, re.Pattern]] = []
+        # Column read for each keyword, in keyword order; duplicates share a column
+        self.keyword_columns: List[int] = []
+
+        for position, keyword in enumerate(self.keywords):
+            if TOKEN_PATTERN.fullmatch(keyword):
+                self.keyword_columns.append(self.columns.setdefault(keyword, position))
+            else:
+                self.regex_columns.append(
+                    (position, re.compile(rf'\b{re.escape(keyword)}\b'))
+                )
+                self.keyword_columns.append(position)
+
+    def count_matrix(self, contents: Iterable[str]) -> List[Dict[int, int]]:
+        """
+        Build the sparse snippet x keyword count matrix.
+
+        Args:
+            contents (Iterable[str]): Snippet texts.
+
+        Returns:
+            List[Dict[int, int]]: One sparse row per snippet mapping keyword
+            column to match count. Columns with zero matches are omitted.
+        """
+        columns = self.columns
+        rows = []
+        for content in contents:
+            lowered = content.lower()
+            row: Dict[int, int] = {}
+            if columns:
+                for token in TOKEN_PATTERN.findall(lowered):
+                    column = columns.get(token)
+                    if column is not None:
+                        row[column] = row.get(column, 0) + 1
+            for column, pattern in self.regex_columns:
+                count = len(pattern.findall(lowered))
+                if count:
+                    row[column] = count
+            rows.append(row)
+        return rows
+
+    def score_rows(self, rows: List[Dict[int, int]]) -> List[float]:
+        """
+        Reduce sparse count rows to relevance scores.
+
+        Args:
+            rows (List[Dict[int, int]]): Rows produced by ``count_matrix``.
+
+        Returns:
+            List[float]: Relevance score between 0 and 1 for each row.
+        """
+        if not self.keywords:
+            return [0.0] * len(rows)
+
+        total = len(self.keywords)
+        keyword_columns = self.keyword_columns
+        scores = []
+        for row in rows:
+            score = 0
+            if row:
+                # Accumulate in keyword order so floating point sums match the
+                # per-keyword loop exactly; zero-count keywords contribute 0.
+                for column in keyword_columns:
+                    count = row.get(column)
+                    if count:
+                        score += 1 - (0.5 ** count)
+            scores.append(min(score / total, 1.0))
+        return scores
+
+    def score_batch(self, contents: Iterable[str]) -> List[float]:
+        """
+        Score a batch of snippets against all keywords.
+
+        Args:
+            contents (Iterable[str]): Snippet texts.
+
+        Returns:
+            List[float]: Relevance score between 0 and 1 for each snippet.
+        """
+        return self.score_rows(self.count_matrix(contents))
@@ -1,11 +1,18 @@
 from typing import Dict, List, Optional
-from venv import logger
 import requests
 from bs4 import BeautifulSoup
 import re
+import logging
+import threading
 from .base_extractor import BaseExtractor
+from .extraction_engine import ExtractionRules
+
+logger = logging.getLogger(__name__)
 
 class SegmentExtractor(BaseExtractor):
+    # Segment pages go through the overridden _fetch_url, so they are never streamed
+    STREAM_THRESHOLD = None
+
     def __init__(self):
         super().__init__()
         self.base_url = 'https://segment.com/docs/'
@@ -15,10 +22,12 @@ class SegmentExtractor(BaseExtractor):
             'audience_segment': ['/audiences/', '/computed-traits/', '/personas/audiences/'],
             'data_integration': ['/connections/destinations/', '/destinations/', '/integrations/']
         }
-        self.session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(max_retries=3)
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        self.rules = ExtractionRules(
+            section_content='p, ul, ol, pre, code',
+            search_content='p, li, pre, code'
+        )
+        # requests.Session is not thread-safe, so every serving thread gets its own
+        self._local = threading.local()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/83.0.4103.61 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -27,6 +36,22 @@ class SegmentExtractor(BaseExtractor):
             'Referer': 'https://www.google.com/'
         }
 
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's HTTP session, created on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = self._new_adapter()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def _new_adapter(self) -> requests.adapters.BaseAdapter:
+        """Transport adapter mounted on each thread's session."""
+        return requests.adapters.HTTPAdapter(max_retries=3)
+
     def get_base_url(self) -> str:
         return self.base_url
 
@@ -34,24 +59,27 @@ class SegmentExtractor(BaseExtractor):
         return 'segment'
 
     def _fetch_url(self, url: str) -> Optional[str]:
-        if "segment.com" in url:
-            return self._fetch_url_with_selenium(url)  # Use Selenium for Segment
-        else:
-            # Use requests for other platforms
-            try:
-                response = self.session.get(url, headers=self.headers, timeout=10)
-                response.raise_for_status()
-                return response.text
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching {url}: {e}")
+        """Fetch a page through the shared scheduler with this thread's session."""
+        try:
+            response = self._polite_get(url, self.session)
+            if response is None:
                 return None
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return None
 
     def extract_source_setup_instructions(self) -> List[Dict]:
         url = self.base_url.rstrip('/') + '/getting-started/sources/'
         html_content = self._fetch_url(url)
         if not html_content:
             return []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        return self._memoized_page(url, html_content, ('source_setup',),
+                                   lambda html: self._source_setup_page(html, url))
+
+    def _source_setup_page(self, html: str, url: str) -> List[Dict]:
+        soup = BeautifulSoup(html, 'html.parser')
 
         # Search for relevant content
         keywords = ['add source', 'set up', 'create source', 'configure source']
@@ -87,7 +115,7 @@ class SegmentExtractor(BaseExtractor):
         Extract documentation for a specific task from Segment's documentation.
         
         For the 'source_setup' task, we use the specialized extraction method.
-        For other tasks, the generic extraction logic is used.
+        For other tasks, the generic extraction rules are used.
         
         Args:
             task (str): The task type.
@@ -96,108 +124,15 @@ class SegmentExtractor(BaseExtractor):
         Returns:
             List[Dict]: List of relevant documentation snippets.
         """
+        if task != 'source_setup':
+            return super().extract_docs(task, relevant_sections)
+        
         # Check cache first
         cached_data = self._get_cached_data(task)
         if cached_data:
             return cached_data
         
-        results = []
-        if task == 'source_setup':
-            results = self.extract_source_setup_instructions()
-            if results:
-                self._cache_data(task, results)
-            return results
-        
-        # Generic extraction for other tasks
-        doc_paths = self.doc_sections.get(task, [])
-        for path in doc_paths:
-            url = self.base_url.rstrip('/') + path
-            html_content = self._fetch_url(url)
-            if not html_content:
-                continue
-            soup = BeautifulSoup(html_content, 'html.parser')
-            relevant_elements = []
-            for section in relevant_sections:
-                headers = soup.find_all(
-                    ['h1', 'h2', 'h3', 'h4'], 
-                    string=re.compile(section, re.IGNORECASE)
-                )
-                for header in headers:
-                    content_elements = []
-                    current = header.find_next()
-                    while current and current.name not in ['h1', 'h2', 'h3', 'h4']:
-                        if current.name in ['p', 'ul', 'ol', 'pre', 'code']:
-                            content_elements.append(current)
-                        current = current.find_next()
-                    if content_elements:
-                        relevant_elements.extend(content_elements)
-            for element in relevant_elements:
-                snippet_text = self._extract_text_from_html(str(element))
-                relevance = self._calculate_relevance(snippet_text, relevant_sections)
-                if relevance > 0:
-                    results.append({
-                        'content': snippet_text,
-                        'url': url,
-                        'relevance': relevance
-                    })
+        results = self.extract_source_setup_instructions()
         if results:
             self._cache_data(task, results)
         return results
-
-    def search(self, query: str) -> List[Dict]:
-        """
-        Segment-specific search implementation.
-        
-        Args:
-            query (str): Search query.
-            
-        Returns:
-            List[Dict]: Relevant documentation snippets.
-        """
-        cache_key = f"search_{hash(query)}"
-        cached_results = self._get_cached_data(cache_key)
-        if cached_results:
-            return cached_results
-
-        results = []
-        keywords = query.lower().split()
-        for task, paths in self.doc_sections.items():
-            for path in paths:
-                url = self.base_url.rstrip('/') + path
-                html_content = self._fetch_url(url)
-                if not html_content:
-                    continue
-                soup = BeautifulSoup(html_content, 'html.parser')
-                elements = soup.find_all(['p', 'li', 'pre', 'code'])
-                for element in elements:
-                    snippet_text = self._extract_text_from_html(str(element))
-                    relevance = self._calculate_relevance(snippet_text, keywords)
-                    if relevance > 0:
-                        results.append({
-                            'content': snippet_text,
-                            'url': url,
-                            'relevance': relevance
-                        })
-        results.sort(key=lambda x: x['relevance'], reverse=True)
-        self._cache_data(cache_key, results)
-        return results
-
-    def _extract_code_examples(self, html_content: str) -> List[str]:
-        """
-        Extract code examples from HTML content.
-        
-        Args:
-            html_content (str): HTML content.
-            
-        Returns:
-            List[str]: List of code examples.
-        """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        code_blocks = []
-        for code in soup.find_all(['pre', 'code']):
-            code_text = code.get_text().strip()
-            if code_text:
-                code_blocks.append(code_text)
-        return code_blocks
-
-    
@@ -0,0 +1,66 @@
+from html import escape
+from html.parser import HTMLParser
+from typing import Iterable, List, Tuple
+
+
+class SectionStream(HTMLParser):
+    """
+    Incremental HTML splitter that emits one markup fragment per heading section.
+
+    Feed it decoded text as it downloads. Whenever a heading starts, the markup
+    collected since the previous heading is completed and queued, so a page is
+    never held in memory as a whole: only the current section is buffered, and
+    that buffer stops growing at `max_section_chars` characters until the next
+    heading.
+    Comments, doctypes and processing instructions are dropped.
+    """
+
+    def __init__(self, heading_tags: Iterable[str], max_section_chars: int = 256 * 1024):
+        super().__init__(convert_charrefs=True)
+        self.heading_tags = frozenset(heading_tags)
+        self.max_section_chars = max_section_chars
+        self.truncated_sections = 0
+        self._sections: List[str] = []
+        self._parts: List[str] = []
+        self._size = 0
+        self._truncated = False
+
+    def _append(self, markup: str) -> None:
+        if self._size + len(markup) > self.max_section_chars:
+            self._truncated = True
+            return
+        self._parts.append(markup)
+        self._size += len(markup)
+
+    def _flush(self) -> None:
+        if self._parts:
+            self._sections.append(''.join(self._parts))
+        if self._truncated:
+            self.truncated_sections += 1
+        self._parts = []
+        self._size = 0
+        self._truncated = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, str]]) -> None:
+        if tag in self.heading_tags:
+            self._flush()
+        self._append(self.get_starttag_text())
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, str]]) -> None:
+        self._append(self.get_starttag_text())
+
+    def handle_endtag(self, tag: str) -> None:
+        self._append(f'</{tag}>')
+
+    def handle_data(self, data: str) -> None:
+        self._append(escape(data, quote=False))
+
+    def close(self) -> None:
+        """Finish parsing and queue the last section."""
+        super().close()
+        self._flush()
+
+    def pop_sections(self) -> List[str]:
+        """Return and forget the sections completed so far."""
+        sections, self._sections = self._sections, []
+        return sections
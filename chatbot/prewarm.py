@@ -0,0 +1,91 @@
+from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+from .docs_extractor import DocsExtractor
+from .fetch_scheduler import PRIORITY_BACKGROUND, fetch_priority
+
+logger = logging.getLogger(__name__)
+
+class Prewarmer:
+    """
+    Fill the documentation cache for every platform x task combination in the background.
+    
+    Progress is exposed through ``status()`` so a readiness probe can hold
+    traffic back until the hot set is cached.
+    """
+
+    def __init__(self, docs_extractor: DocsExtractor, max_workers: int = 8):
+        self.docs_extractor = docs_extractor
+        self.max_workers = max_workers
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start warming the cache in a daemon thread. Calling it twice is a no-op."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name='prewarm', daemon=True)
+        self._thread.start()
+
+    def run(self) -> None:
+        """Warm every combination concurrently and block until all are done."""
+        combinations = self.docs_extractor.get_combinations()
+        with self._lock:
+            self.total = len(combinations)
+            self.started_at = time.time()
+        logger.info(f"Prewarming {self.total} platform/task combinations")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for platform, task in combinations:
+                executor.submit(self._warm, platform, task)
+
+        with self._lock:
+            self.finished_at = time.time()
+        logger.info(
+            f"Prewarm finished: {self.completed - self.failed}/{self.total} cached "
+            f"in {self.finished_at - self.started_at:.1f}s"
+        )
+
+    def _warm(self, platform: str, task: str) -> None:
+        """Fetch one combination, recording whether it produced any documentation."""
+        try:
+            # Warm-up traffic yields to user-facing fetches on the same host
+            with fetch_priority(PRIORITY_BACKGROUND):
+                docs = self.docs_extractor.get_relevant_docs(platform, task)
+            ok = bool(docs)
+        except Exception as e:
+            logger.error(f"Prewarm failed for {platform}/{task}: {e}")
+            ok = False
+        with self._lock:
+            self.completed += 1
+            if not ok:
+                self.failed += 1
+
+    def is_ready(self) -> bool:
+        """Return True once every combination has been attempted."""
+        with self._lock:
+            return self.finished_at is not None
+
+    def status(self) -> Dict:
+        """
+        Report warm-up progress
+        
+        Returns:
+            Dict: Counts of total, completed and failed combinations plus readiness
+        """
+        with self._lock:
+            return {
+                'ready': self.finished_at is not None,
+                'total': self.total,
+                'completed': self.completed,
+                'failed': self.failed,
+                'elapsed_seconds': round((self.finished_at or time.time()) - self.started_at, 2)
+                if self.started_at else 0.0
+            }
@@ -0,0 +1,196 @@
+from typing import Any, Callable, Dict, List, Optional
+from contextvars import ContextVar
+import cProfile
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SampledRequest:
+    """
+    The cProfile profiles of one sampled request.
+
+    cProfile only sees the thread that enabled it, so work the request hands
+    to pool threads (bulkhead extractions, comparison answers) is profiled
+    by ``profiled`` into one extra profile per task, merged in at the end.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.workers: List[cProfile.Profile] = []
+        self.finished = False
+        self.token = None
+        self._lock = threading.Lock()
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            # Work that outlives the request (e.g. a timed-out extraction) is not counted
+            if not self.finished:
+                self.workers.append(profile)
+
+    def close(self) -> pstats.Stats:
+        """Merge the request's profiles; later worker profiles are dropped."""
+        with self._lock:
+            self.finished = True
+            workers = list(self.workers)
+        stats = pstats.Stats(self.profile)
+        for profile in workers:
+            stats.add(profile)
+        return stats
+
+
+_sampled_request: ContextVar[Optional[SampledRequest]] = ContextVar('sampled_request', default=None)
+
+
+def profiled(fn: Callable, *args) -> Any:
+    """
+    Call `fn`, profiling it as part of the current sampled request, if any.
+
+    Wrap work submitted to other threads with this, inside a copy of the
+    submitting context, so it shows up in the request's profile.
+    """
+    sampled = _sampled_request.get()
+    # The request's own thread is covered already; never replace an active profiler
+    if sampled is None or sampled.finished or sys.getprofile() is not None:
+        return fn(*args)
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        return fn(*args)
+    finally:
+        profile.disable()
+        sampled.add(profile)
+
+class RequestProfiler:
+    """
+    Sample a percentage of requests with cProfile.
+
+    Each sampled request's profile is written to `output_dir`, tagged with
+    the platform and task it resolved to, and merged into an in-process
+    aggregate that can be read as a hot-function table at any time. The
+    sample percentage can be changed at runtime without a restart.
+    """
+
+    SORT_KEYS = {'cumulative': 3, 'tottime': 2, 'calls': 1}
+
+    def __init__(self, percent: float = 0.0, output_dir: str = os.path.join('cache', 'profiles'),
+                 max_profiles: int = 200):
+        self.percent = percent
+        self.output_dir = output_dir
+        self.max_profiles = max_profiles
+        self.sampled = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    def set_percent(self, percent: float) -> None:
+        """Change the share of requests that are profiled (0-100)."""
+        self.percent = max(0.0, min(100.0, float(percent)))
+
+    def start(self) -> Optional[SampledRequest]:
+        """
+        Start profiling the current request if it is sampled.
+
+        Work the request runs through ``profiled`` in other threads is
+        profiled with it.
+
+        Returns:
+            Optional[SampledRequest]: The running profile, or None if the
+            request is not sampled.
+        """
+        if self.percent <= 0 or random.random() * 100 >= self.percent:
+            return None
+        if sys.getprofile() is not None:
+            # Another profiler is already active in this thread
+            return None
+        sampled = SampledRequest()
+        sampled.profile.enable()
+        sampled.token = _sampled_request.set(sampled)
+        return sampled
+
+    def finish(self, sampled: Optional[SampledRequest], platform: Optional[str] = None,
+               task: Optional[str] = None) -> None:
+        """
+        Stop a sampled profile, write it to disk and merge it into the aggregate.
+
+        Args:
+            sampled (Optional[SampledRequest]): Profile returned by ``start``.
+            platform (Optional[str]): Platform the request resolved to.
+            task (Optional[str]): Task the request resolved to.
+        """
+        if sampled is None:
+            return
+        sampled.profile.disable()
+        _sampled_request.reset(sampled.token)
+        stats = sampled.close()
+
+        tag = '_'.join(re.sub(r'\W+', '', value or 'none') for value in (platform, task))
+        path = os.path.join(self.output_dir, f"{time.time():.6f}_{tag}.prof")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stats.dump_stats(path)
+            self._prune()
+        except OSError as e:
+            logger.error(f"Error writing profile {path}: {e}")
+
+        with self._lock:
+            self.sampled += 1
+            if self._stats is None:
+                self._stats = stats
+            else:
+                self._stats.add(stats)
+
+    def _prune(self) -> None:
+        """Keep only the newest `max_profiles` profile files."""
+        files = sorted(name for name in os.listdir(self.output_dir) if name.endswith('.prof'))
+        for name in files[:-self.max_profiles]:
+            try:
+                os.remove(os.path.join(self.output_dir, name))
+            except OSError:
+                pass
+
+    def hot_functions(self, limit: int = 25, sort: str = 'cumulative') -> List[Dict]:
+        """
+        Return the aggregated hottest functions across all sampled requests.
+
+        Args:
+            limit (int): Number of rows to return.
+            sort (str): 'cumulative', 'tottime' or 'calls'.
+
+        Returns:
+            List[Dict]: One row per function with call counts and times in ms.
+        """
+        index = self.SORT_KEYS.get(sort, self.SORT_KEYS['cumulative'])
+        with self._lock:
+            if self._stats is None:
+                return []
+            rows = sorted(self._stats.stats.items(), key=lambda item: item[1][index], reverse=True)[:limit]
+        return [
+            {
+                'function': f"{filename}:{line}({name})",
+                'calls': calls,
+                'tottime_ms': round(tottime * 1000, 3),
+                'cumtime_ms': round(cumtime * 1000, 3)
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+        ]
+
+    def reset(self) -> None:
+        """Drop the aggregated statistics."""
+        with self._lock:
+            self._stats = None
+            self.sampled = 0
+
+    def status(self) -> Dict:
+        """Report the sampling configuration and how many requests were profiled."""
+        return {
+            'percent': self.percent,
+            'sampled': self.sampled,
+            'output_dir': self.output_dir
+        }
@@ -0,0 +1,136 @@
+from typing import List, Optional, Tuple
+from collections import Counter, deque
+import logging
+import threading
+import time
+from .docs_extractor import DocsExtractor, shared_docs_key
+from .fetch_scheduler import PRIORITY_BACKGROUND, fetch_priority
+
+logger = logging.getLogger(__name__)
+
+class QueryLog:
+    """
+    Compact rolling log of resolved questions.
+
+    Only the platform, task and keywords of each question are kept, in a
+    bounded deque, so the log stays small under any amount of traffic.
+    """
+
+    def __init__(self, max_entries: int = 10000, window: float = 60 * 60):
+        self.window = window
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def record(self, platform: str, task: Optional[str], keywords: List[str]) -> None:
+        """
+        Record one resolved question.
+
+        Args:
+            platform (str): The CDP platform
+            task (Optional[str]): The task type, if one was identified
+            keywords (List[str]): Keywords extracted from the question
+        """
+        with self._lock:
+            self._entries.append((time.time(), platform, task, ' '.join(keywords)))
+
+    def _recent(self, window: Optional[float] = None) -> List[Tuple[float, str, Optional[str], str]]:
+        cutoff = time.time() - (window or self.window)
+        with self._lock:
+            return [entry for entry in self._entries if entry[0] >= cutoff]
+
+    def top_pairs(self, limit: int = 5, window: Optional[float] = None) -> List[Tuple[Tuple[str, str], int]]:
+        """
+        Rank (platform, task) pairs by how often they were asked recently.
+
+        Args:
+            limit (int): Maximum number of pairs to return
+            window (Optional[float]): Look-back window in seconds
+
+        Returns:
+            List[Tuple[Tuple[str, str], int]]: Pairs with their recent counts, most asked first
+        """
+        counts = Counter(
+            (platform, task) for _, platform, task, _ in self._recent(window) if task
+        )
+        return counts.most_common(limit)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class AdaptivePrefetcher:
+    """
+    Keep the most-asked answers warm ahead of their TTL expiry.
+
+    Every `interval` seconds the hottest (platform, task) pairs from the
+    query log, the docs ``/ask`` answers from, are refreshed in the
+    background if they are missing from the cache or will expire within
+    `refresh_margin` seconds. With a shared cache, each pair is refreshed
+    by one worker per host: the others skip it while that worker holds its
+    lock and afterwards adopt the shared entry instead of crawling again.
+    """
+
+    def __init__(self, docs_extractor: DocsExtractor, query_log: QueryLog, top_pairs: int = 8,
+                 interval: float = 60.0, refresh_margin: float = 10 * 60):
+        self.docs_extractor = docs_extractor
+        self.query_log = query_log
+        self.top_pairs = top_pairs
+        self.interval = interval
+        self.refresh_margin = refresh_margin
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the prefetch loop in a daemon thread. Calling it twice is a no-op."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='adaptive-prefetch', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the prefetch loop to exit."""
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Adaptive prefetch failed: {e}")
+
+    def _needs_refresh(self, age: Optional[float]) -> bool:
+        return age is None or age >= self.docs_extractor.cache_duration - self.refresh_margin
+
+    def run_once(self) -> int:
+        """
+        Refresh hot entries that are missing or close to expiry.
+
+        Returns:
+            int: Number of entries refreshed
+        """
+        refreshed = 0
+        with fetch_priority(PRIORITY_BACKGROUND):
+            for (platform, task), _ in self.query_log.top_pairs(self.top_pairs):
+                if self._needs_refresh(self.docs_extractor.get_cache_age(platform, task)):
+                    refreshed += self._refresh(platform, task)
+
+        if refreshed:
+            logger.info(f"Adaptive prefetch refreshed {refreshed} hot entries")
+        return refreshed
+
+    def _refresh(self, platform: str, task: str) -> bool:
+        shared_cache = self.docs_extractor.shared_cache
+        if shared_cache is None:
+            self.docs_extractor.get_relevant_docs(platform, task, force_refresh=True)
+            return True
+
+        with shared_cache.try_lock(f"prefetch_{platform}_{task}") as acquired:
+            if not acquired:
+                # Another worker is refreshing it; adopt its entry on a later pass
+                return False
+            if self._needs_refresh(shared_cache.age(shared_docs_key(platform, task))):
+                self.docs_extractor.get_relevant_docs(platform, task, force_refresh=True)
+            elif self.docs_extractor.load_shared_docs(platform, task) is None:
+                return False
+            return True
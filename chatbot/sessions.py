@@ -0,0 +1,102 @@
+from typing import List, Optional
+from collections import OrderedDict
+import threading
+import time
+from .snippet import Snippet
+
+
+class ConversationSession:
+    """What the last answered question in a conversation resolved to."""
+
+    __slots__ = ('platform', 'task', 'snippets', 'last_used')
+
+    def __init__(self):
+        self.platform: Optional[str] = None
+        self.task: Optional[str] = None
+        self.snippets: List[Snippet] = []
+        self.last_used = time.time()
+
+
+class SessionStore:
+    """
+    In-memory conversation sessions keyed by a client-supplied session ID.
+
+    Each session keeps the platform, task and snippets of its last answer so
+    follow-up questions can fill in what they leave out and reuse the
+    retrieved snippets. Sessions expire `ttl` seconds after their last use;
+    at most `max_sessions` are kept (least recently used are evicted first)
+    and each holds at most `max_snippets` snippets, so memory stays bounded
+    under any number of users.
+    """
+
+    def __init__(self, ttl: float = 30 * 60, max_sessions: int = 10000, max_snippets: int = 20,
+                 max_id_length: int = 128):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_snippets = max_snippets
+        self.max_id_length = max_id_length
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _valid_id(self, session_id: Optional[str]) -> bool:
+        return bool(session_id) and len(session_id) <= self.max_id_length
+
+    def get(self, session_id: Optional[str]) -> Optional[ConversationSession]:
+        """
+        Return a live session.
+
+        Args:
+            session_id (Optional[str]): Client session ID.
+
+        Returns:
+            Optional[ConversationSession]: The session, or None if it is
+            unknown or expired.
+        """
+        if not self._valid_id(session_id):
+            return None
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if time.time() - session.last_used > self.ttl:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def update(self, session_id: Optional[str], platform: str, task: Optional[str],
+               snippets: Optional[List[Snippet]] = None) -> None:
+        """
+        Remember what a session's latest question resolved to.
+
+        Args:
+            session_id (Optional[str]): Client session ID (ignored if empty).
+            platform (str): The CDP platform
+            task (Optional[str]): The task type, if one was identified
+            snippets (Optional[List[Snippet]]): Snippets the answer was built from
+        """
+        if not self._valid_id(session_id):
+            return
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = ConversationSession()
+            self._sessions.move_to_end(session_id)
+            session.platform = platform
+            session.task = task
+            session.snippets = list(snippets or [])[:self.max_snippets]
+            session.last_used = now
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        # Oldest sessions are at the front; drop expired ones, then any over the cap
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_used <= self.ttl and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
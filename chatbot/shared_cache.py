@@ -0,0 +1,145 @@
+from typing import Any, Iterator, Optional
+from contextlib import contextmanager
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class SharedFileCache:
+    """
+    On-disk JSON cache that several worker processes can read and write safely.
+    
+    Entries are written atomically (temp file + ``os.replace``) so readers never
+    see a partial file, and ``lock(key)`` takes an exclusive ``flock`` so only
+    one worker computes a missing entry while the others wait and then read it.
+    """
+
+    def __init__(self, cache_dir: str, cache_duration: float = 24 * 60 * 60):
+        self.cache_dir = cache_dir
+        self.cache_duration = cache_duration
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str, suffix: str = '.json') -> str:
+        """Get the file path for a cache key."""
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        safe_key = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in key)[:64]
+        return os.path.join(self.cache_dir, f"{safe_key}_{digest}{suffix}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value for a key if present and not expired.
+        
+        Args:
+            key (str): Cache key.
+            
+        Returns:
+            Optional[Any]: The cached value, or None.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading shared cache file {path}: {e}")
+            return None
+        if time.time() - entry.get('timestamp', 0) >= self.cache_duration:
+            return None
+        return entry.get('data')
+
+    def age(self, key: str) -> Optional[float]:
+        """
+        Return how many seconds ago a key was written.
+        
+        Args:
+            key (str): Cache key.
+            
+        Returns:
+            Optional[float]: Age in seconds, or None if the key is missing or unreadable.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                return time.time() - json.load(f).get('timestamp', 0)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading shared cache file {path}: {e}")
+            return None
+
+    def set(self, key: str, data: Any) -> None:
+        """
+        Atomically store a value for a key.
+        
+        Args:
+            key (str): Cache key.
+            data (Any): JSON-serializable value.
+        """
+        path = self._path(key)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'timestamp': time.time(), 'data': data}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Error writing shared cache file {path}: {e}")
+
+    def delete(self, key: str) -> None:
+        """Remove the entry for a key if it exists."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """
+        Hold an exclusive cross-process lock for a key.
+        
+        Args:
+            key (str): Cache key to lock.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(self._path(key, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def try_lock(self, key: str) -> Iterator[bool]:
+        """
+        Take the cross-process lock for a key only if it is free.
+        
+        Args:
+            key (str): Cache key to lock.
+            
+        Yields:
+            bool: True if this process holds the lock, False if another one does.
+        """
+        if fcntl is None:
+            yield True
+            return
+        with open(self._path(key, '.lock'), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
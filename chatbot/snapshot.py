@@ -0,0 +1,297 @@
+"""
+Portable, memory-mapped snapshots of the extracted documentation corpus.
+
+Layout (all integers little-endian)::
+
+    MAGIC
+    compressed content blocks       zlib(JSON list of snippet dicts), BLOCK_SIZE snippets each
+    block offset table              uint64[blocks + 1], absolute file offsets
+    postings                        uint32[] snippet ids, referenced by the metadata
+    metadata                        zlib(JSON): term and answer postings ranges, counts
+    footer                          uint64 metadata offset, uint64 metadata length, MAGIC
+
+Readers ``mmap`` the file, parse only the small metadata, and decompress a
+content block only when a query touches one of its snippets.
+
+Usage:
+    python -m chatbot.snapshot export corpus.snap
+    python -m chatbot.snapshot import corpus.snap [--to cache/corpus.snap]
+    python -m chatbot.snapshot info corpus.snap
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from array import array
+from functools import lru_cache
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from .platform_extractors.relevance import RelevanceScorer, tokenize
+from .snippet import Snippet
+
+MAGIC = b'CDPSNAP1'
+FOOTER = struct.Struct('<QQ')
+FORMAT_VERSION = 1
+BLOCK_SIZE = 64
+DEFAULT_SNAPSHOT_PATH = os.path.join('cache', 'corpus.snap')
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(buffer, typecode: str, start: int, count: int) -> array:
+    values = array(typecode)
+    values.frombytes(buffer[start:start + count * values.itemsize])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def write_snapshot(path: str, answers: Iterable[Tuple[str, str, List[Snippet]]]) -> Dict:
+    """
+    Write a corpus snapshot atomically.
+
+    Args:
+        path (str): Destination file.
+        answers (Iterable[Tuple[str, str, List[Snippet]]]): (platform, task, snippets)
+            triples, with snippets in answer order.
+
+    Returns:
+        Dict: The snapshot metadata.
+    """
+    snippets: List[Dict] = []
+    answer_ids: Dict[str, List[int]] = {}
+    term_ids: Dict[str, List[int]] = {}
+
+    for platform, task, docs in answers:
+        ids = []
+        for doc in docs:
+            snippet_id = len(snippets)
+            record = doc.to_dict() if isinstance(doc, Snippet) else dict(doc)
+            record.setdefault('platform', platform)
+            snippets.append(record)
+            ids.append(snippet_id)
+            for term in set(tokenize(record['content'])):
+                term_ids.setdefault(term, []).append(snippet_id)
+        answer_ids[f"{platform}/{task}"] = ids
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+
+            block_offsets = array('Q')
+            for start in range(0, len(snippets), BLOCK_SIZE):
+                block_offsets.append(f.tell())
+                block = json.dumps(snippets[start:start + BLOCK_SIZE], separators=(',', ':'))
+                f.write(zlib.compress(block.encode('utf-8'), 6))
+            block_offsets.append(f.tell())
+
+            offsets_start = f.tell()
+            f.write(_to_little_endian(block_offsets))
+
+            postings = array('I')
+            terms = {}
+            for term, ids in sorted(term_ids.items()):
+                terms[term] = [len(postings), len(ids)]
+                postings.extend(ids)
+            answer_ranges = {}
+            for key, ids in answer_ids.items():
+                answer_ranges[key] = [len(postings), len(ids)]
+                postings.extend(ids)
+            postings_start = f.tell()
+            f.write(_to_little_endian(postings))
+
+            metadata = {
+                'version': FORMAT_VERSION,
+                'created': time.time(),
+                'block_size': BLOCK_SIZE,
+                'snippet_count': len(snippets),
+                'block_count': len(block_offsets) - 1,
+                'offsets_start': offsets_start,
+                'postings_start': postings_start,
+                'terms': terms,
+                'answers': answer_ranges
+            }
+            metadata_bytes = zlib.compress(json.dumps(metadata, separators=(',', ':')).encode('utf-8'))
+            metadata_start = f.tell()
+            f.write(metadata_bytes)
+            f.write(FOOTER.pack(metadata_start, len(metadata_bytes)))
+            f.write(MAGIC)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return metadata
+
+
+class SnapshotReader:
+    """
+    Read-only, memory-mapped view of a corpus snapshot.
+
+    Opening a snapshot only parses its metadata; content blocks are
+    decompressed on demand and a small number are kept decoded.
+    """
+
+    def __init__(self, path: str, cached_blocks: int = 64):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty, not a corpus snapshot")
+
+        size = len(self._mmap)
+        tail = FOOTER.size + len(MAGIC)
+        if size < len(MAGIC) + tail or self._mmap[:len(MAGIC)] != MAGIC or self._mmap[-len(MAGIC):] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a corpus snapshot")
+
+        metadata_start, metadata_length = FOOTER.unpack(self._mmap[size - tail:size - len(MAGIC)])
+        self.metadata = json.loads(zlib.decompress(self._mmap[metadata_start:metadata_start + metadata_length]))
+        if self.metadata.get('version') != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {self.metadata.get('version')}")
+
+        self.block_size = self.metadata['block_size']
+        self.block_offsets = _read_array(
+            self._mmap, 'Q', self.metadata['offsets_start'], self.metadata['block_count'] + 1
+        )
+        self._block = lru_cache(maxsize=cached_blocks)(self._decode_block)
+
+    def close(self) -> None:
+        """Unmap the snapshot and close the file."""
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def _decode_block(self, index: int) -> List[Dict]:
+        start, end = self.block_offsets[index], self.block_offsets[index + 1]
+        return json.loads(zlib.decompress(self._mmap[start:end]))
+
+    def _postings(self, start: int, count: int) -> array:
+        offset = self.metadata['postings_start'] + start * 4
+        return _read_array(self._mmap, 'I', offset, count)
+
+    def get_snippet(self, snippet_id: int) -> Snippet:
+        """
+        Decode one snippet by id.
+
+        Args:
+            snippet_id (int): Snippet id.
+
+        Returns:
+            Snippet: The snippet.
+        """
+        block = self._block(snippet_id // self.block_size)
+        return Snippet.from_dict(block[snippet_id % self.block_size])
+
+    def get_docs(self, platform: str, task: str) -> Optional[List[Snippet]]:
+        """
+        Return the stored answer snippets for a platform and task.
+
+        Args:
+            platform (str): The CDP platform name.
+            task (str): The task type.
+
+        Returns:
+            Optional[List[Snippet]]: Snippets in answer order, or None if the
+            snapshot has no entry for the pair.
+        """
+        answer = self.metadata['answers'].get(f"{platform}/{task}")
+        if answer is None:
+            return None
+        return [self.get_snippet(snippet_id) for snippet_id in self._postings(*answer)]
+
+    def search(self, query: str, platform: Optional[str] = None) -> List[Snippet]:
+        """
+        Free-text search over the snapshot using its term postings.
+
+        Args:
+            query (str): Search query.
+            platform (Optional[str]): Limit results to one platform.
+
+        Returns:
+            List[Snippet]: Matching snippets, most relevant first.
+        """
+        keywords = query.lower().split()
+        candidate_ids = set()
+        for term in {token for keyword in keywords for token in tokenize(keyword)}:
+            posting = self.metadata['terms'].get(term)
+            if posting:
+                candidate_ids.update(self._postings(*posting))
+
+        candidates = [self.get_snippet(snippet_id) for snippet_id in sorted(candidate_ids)]
+        if platform:
+            candidates = [snippet for snippet in candidates if snippet.platform == platform]
+        scores = RelevanceScorer(keywords).score_batch(snippet.content for snippet in candidates)
+
+        results = []
+        for snippet, relevance in zip(candidates, scores):
+            if relevance > 0:
+                snippet.relevance = relevance
+                results.append(snippet)
+        results.sort(key=lambda x: x.relevance, reverse=True)
+        return results
+
+    def answer_keys(self) -> List[str]:
+        """Return the 'platform/task' keys stored in the snapshot."""
+        return list(self.metadata['answers'])
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Export, import or inspect corpus snapshots')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='extract every platform/task answer and write a snapshot')
+    export_parser.add_argument('path')
+
+    import_parser = subparsers.add_parser('import', help='validate a snapshot and install it for workers to load')
+    import_parser.add_argument('path')
+    import_parser.add_argument('--to', default=DEFAULT_SNAPSHOT_PATH)
+
+    info_parser = subparsers.add_parser('info', help='print snapshot metadata')
+    info_parser.add_argument('path')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        from .docs_extractor import DocsExtractor
+
+        metadata = DocsExtractor().export_snapshot(args.path)
+        print(f"Wrote {metadata['snippet_count']} snippets for {len(metadata['answers'])} answers to {args.path}")
+    elif args.command == 'import':
+        reader = SnapshotReader(args.path)
+        count = reader.metadata['snippet_count']
+        reader.close()
+        os.makedirs(os.path.dirname(os.path.abspath(args.to)), exist_ok=True)
+        tmp_path = f"{args.to}.tmp"
+        shutil.copyfile(args.path, tmp_path)
+        os.replace(tmp_path, args.to)
+        print(f"Installed snapshot with {count} snippets at {args.to}")
+    else:
+        reader = SnapshotReader(args.path)
+        metadata = reader.metadata
+        print(f"version:  {metadata['version']}")
+        print(f"created:  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(metadata['created']))}")
+        print(f"snippets: {metadata['snippet_count']} in {metadata['block_count']} blocks")
+        print(f"terms:    {len(metadata['terms'])}")
+        print(f"answers:  {', '.join(sorted(metadata['answers']))}")
+        reader.close()
+
+
+if __name__ == '__main__':
+    main()
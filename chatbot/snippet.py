@@ -0,0 +1,142 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+import sys
+
+ExamplesSource = Union[None, List[str], Callable[[], List[str]]]
+
+_EMPTY = ()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+class Snippet:
+    """
+    Compact documentation snippet used inside the retrieval pipeline.
+
+    Snippets use ``__slots__`` instead of a per-instance dict, intern their
+    repeated URL, platform and type fields, and keep example lists as
+    tuples (or a deferred callable) that are only turned into lists when
+    read. ``to_dict``/``from_dict`` convert to and from the plain dict format
+    used at API and cache boundaries, and item access (``snippet['content']``,
+    ``snippet.get('url')``) keeps existing dict-style callers working.
+    """
+
+    __slots__ = (
+        'content', 'url', 'relevance', 'platform', 'content_type', 'section_type',
+        '_code_examples', '_configuration_examples', 'api_details', 'token_spans'
+    )
+
+    # Optional fields, in the order they appear in the dict format
+    OPTIONAL_FIELDS = ('platform', 'content_type', 'section_type', 'code_examples',
+                       'configuration_examples', 'api_details')
+    FIELDS = ('content', 'relevance', 'url') + OPTIONAL_FIELDS
+
+    def __init__(self, content: str, url: str = '', relevance: float = 1.0,
+                 platform: Optional[str] = None, content_type: Optional[str] = None,
+                 section_type: Optional[str] = None, code_examples: ExamplesSource = None,
+                 configuration_examples: ExamplesSource = None,
+                 api_details: Optional[Dict] = None):
+        self.content = content
+        self.url = _intern(url)
+        self.relevance = relevance
+        self.platform = _intern(platform)
+        self.content_type = _intern(content_type)
+        self.section_type = _intern(section_type)
+        self._code_examples = self._pack(code_examples)
+        self._configuration_examples = self._pack(configuration_examples)
+        self.api_details = api_details or None
+        # Word token offsets into content, recorded once when the snippet is
+        # processed (see chatbot.passages); not part of the dict format
+        self.token_spans = None
+
+    @staticmethod
+    def _pack(examples: ExamplesSource):
+        if callable(examples):
+            return examples
+        return tuple(examples) if examples else _EMPTY
+
+    def _unpack(self, attribute: str) -> List[str]:
+        examples = getattr(self, attribute)
+        if callable(examples):
+            # Materialize deferred examples once and keep the compact tuple
+            examples = tuple(examples() or _EMPTY)
+            setattr(self, attribute, examples)
+        return list(examples)
+
+    @property
+    def code_examples(self) -> List[str]:
+        return self._unpack('_code_examples')
+
+    @property
+    def configuration_examples(self) -> List[str]:
+        return self._unpack('_configuration_examples')
+
+    @classmethod
+    def from_dict(cls, doc: Dict) -> 'Snippet':
+        """
+        Build a snippet from the plain dict format.
+
+        Args:
+            doc (Dict): Snippet dict with at least a 'content' key.
+
+        Returns:
+            Snippet: The compact snippet.
+        """
+        return cls(
+            content=doc['content'],
+            url=doc.get('url', ''),
+            relevance=doc.get('relevance', 1.0),
+            platform=doc.get('platform'),
+            content_type=doc.get('content_type'),
+            section_type=doc.get('section_type'),
+            code_examples=doc.get('code_examples'),
+            configuration_examples=doc.get('configuration_examples'),
+            api_details=doc.get('api_details')
+        )
+
+    def to_dict(self) -> Dict:
+        """
+        Convert to the plain dict format, omitting empty optional fields.
+
+        Returns:
+            Dict: Snippet dict.
+        """
+        doc = {
+            'content': self.content,
+            'relevance': self.relevance,
+            'url': self.url
+        }
+        for field in self.OPTIONAL_FIELDS:
+            value = getattr(self, field)
+            if value:
+                doc[field] = value
+        return doc
+
+    # Dict-style access for callers written against the dict format
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.to_dict()
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Snippet):
+            other = other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"Snippet(url={self.url!r}, relevance={self.relevance!r}, content={self.content[:40]!r})"
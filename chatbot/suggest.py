@@ -0,0 +1,173 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from bisect import bisect_left
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Display names for the supported platforms
+PLATFORM_NAMES = {
+    'segment': 'Segment',
+    'mparticle': 'mParticle',
+    'lytics': 'Lytics',
+    'zeotap': 'Zeotap'
+}
+
+# Question templates per task; each one is classified by QuestionHandler.extract_task
+TASK_PHRASES = {
+    'source_setup': [
+        'How do I set up a new source in {platform}?',
+        'How do I add a data source in {platform}?'
+    ],
+    'profile_creation': [
+        'How do I create a user profile in {platform}?',
+        'How do I build user profiles in {platform}?'
+    ],
+    'audience_segment': [
+        'How do I build an audience segment in {platform}?',
+        'How do I create a segment in {platform}?'
+    ],
+    'data_integration': [
+        'How do I integrate data with {platform}?',
+        'How do I sync data from {platform} to a destination?'
+    ]
+}
+
+WORD_START = re.compile(r'(?:^|(?<=\s))\S')
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace so typed prefixes match phrases."""
+    return ' '.join(text.lower().split())
+
+
+class Suggestion:
+    """One completion: the question text and what it resolves to."""
+
+    __slots__ = ('text', 'platform', 'task', 'weight')
+
+    def __init__(self, text: str, platform: Optional[str], task: Optional[str], weight: float):
+        self.text = text
+        self.platform = platform
+        self.task = task
+        self.weight = weight
+
+    def to_dict(self) -> Dict:
+        return {'text': self.text, 'platform': self.platform, 'task': self.task}
+
+
+class SuggestionIndex:
+    """
+    Prefix index for typeahead completions.
+
+    Every phrase is indexed under each of its word-start suffixes, so typing
+    "audience" completes "How do I build an audience segment in Lytics?".
+    Keys live in one sorted list and a lookup is a single ``bisect`` followed
+    by a short scan of the matching range. The index is rebuilt from `source`
+    at most every `refresh_interval` seconds in a background thread; lookups
+    keep using the previous index while a rebuild runs. Only the very first
+    lookup waits for a build.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[Suggestion]], refresh_interval: float = 60.0,
+                 max_scan: int = 500):
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.max_scan = max_scan
+        self._keys: List[str] = []
+        self._entries: List[Tuple[int, int]] = []
+        self._suggestions: List[Suggestion] = []
+        self._built = 0.0
+        self._rebuild_lock = threading.Lock()
+
+    def rebuild(self) -> int:
+        """
+        Rebuild the index from the source.
+
+        Returns:
+            int: Number of indexed phrases
+        """
+        suggestions = []
+        seen = set()
+        for suggestion in self.source():
+            key = normalize(suggestion.text)
+            if key and key not in seen:
+                seen.add(key)
+                suggestions.append(suggestion)
+
+        rows = []
+        for index, suggestion in enumerate(suggestions):
+            text = normalize(suggestion.text)
+            for match in WORD_START.finditer(text):
+                rows.append((text[match.start():], match.start(), index))
+        rows.sort()
+
+        # Swap in the new index in one assignment so readers never see a mix
+        self._keys, self._entries, self._suggestions = (
+            [key for key, _, _ in rows],
+            [(offset, index) for _, offset, index in rows],
+            suggestions
+        )
+        self._built = time.time()
+        return len(suggestions)
+
+    def _refresh_if_stale(self) -> None:
+        if time.time() - self._built < self.refresh_interval:
+            return
+        # Only one thread rebuilds; the others keep answering from the old index
+        if not self._rebuild_lock.acquire(blocking=False):
+            return
+        if not self._built:
+            # Nothing to serve yet, so the first lookup waits for the build
+            self._locked_rebuild()
+            return
+        threading.Thread(target=self._locked_rebuild, name='suggestion-index', daemon=True).start()
+
+    def _locked_rebuild(self) -> None:
+        """Rebuild while holding the rebuild lock, releasing it when done."""
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.error(f"Error rebuilding suggestion index: {e}")
+            self._built = time.time()
+        finally:
+            self._rebuild_lock.release()
+
+    def complete(self, prefix: str, limit: int = 8) -> List[Dict]:
+        """
+        Return ranked completions for a typed prefix.
+
+        Phrases that start with the prefix rank before phrases where it starts
+        a later word; ties are broken by weight, then by shorter text.
+
+        Args:
+            prefix (str): What the user has typed so far
+            limit (int): Maximum number of completions
+
+        Returns:
+            List[Dict]: Completions with their text, platform and task
+        """
+        self._refresh_if_stale()
+        query = normalize(prefix)
+        if not query:
+            return []
+
+        keys, entries, suggestions = self._keys, self._entries, self._suggestions
+        best: Dict[int, Tuple] = {}
+        position = bisect_left(keys, query)
+        end = min(len(keys), position + self.max_scan)
+        while position < end and keys[position].startswith(query):
+            offset, index = entries[position]
+            suggestion = suggestions[index]
+            rank = (offset > 0, -suggestion.weight, len(suggestion.text), suggestion.text)
+            if index not in best or rank < best[index]:
+                best[index] = rank
+            position += 1
+
+        ranked = sorted(best, key=best.get)[:limit]
+        return [suggestions[index].to_dict() for index in ranked]
+
+    def __len__(self) -> int:
+        return len(self._suggestions)
@@ -0,0 +1,20 @@
+# Production server settings: pre-forked workers sharing one on-disk answer cache.
+#
+#     gunicorn -c gunicorn.conf.py app:app
+#
+# Every setting can be overridden with the matching CHATBOT_* environment variable.
+import multiprocessing
+import os
+
+bind = os.environ.get('CHATBOT_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('CHATBOT_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# The chatbot stack is thread-safe (see benchmarks/bench_threads.py), so threads > 1 is supported.
+# Keep CHATBOT_BULKHEAD_CONCURRENCY + CHATBOT_BULKHEAD_QUEUE (2 + 4 by default) below this,
+# so one slow docs site cannot hold every thread
+threads = int(os.environ.get('CHATBOT_THREADS', 8))
+timeout = int(os.environ.get('CHATBOT_TIMEOUT', 60))
+accesslog = '-'
+
+# Workers read and write answers through a shared cache directory, so a page
+# crawled by one worker is served by all of them.
+os.environ.setdefault('CHATBOT_SHARED_CACHE_DIR', os.path.join('cache', 'shared'))